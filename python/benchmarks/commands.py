@@ -0,0 +1,310 @@
+"""Microbenchmarks for the youtube simulator commands.
+
+For each catalog size a synthetic video file is generated and loaded, a
+set of playlists is created, and then every command is executed through a
+CommandParser many times and timed one execution at a time. The results
+are printed and written to a JSON file, so runs can be compared to catch
+regressions:
+
+    python3 -m benchmarks.commands --sizes 1000 100000 --output results.json
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.command_parser import CommandParser
+from src.output_sink import NullSink
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+_WORDS = (
+    "amazing funny cats dogs life google video about nothing music game "
+    "travel food news sport cooking science history nature space cars "
+    "movie trailer review live concert tutorial python coding art "
+    "dance").split()
+
+# How many tags the synthetic catalogs draw from, and how many playlists
+# of how many videos are created before the commands are timed.
+_TAG_COUNT = 500
+_PLAYLIST_COUNT = 100
+_PLAYLIST_LENGTH = 100
+
+# Even slow commands are timed at least this many times.
+_MIN_ITERATIONS = 3
+
+
+def generate_catalog(path, size, seed=0):
+    """Writes a synthetic video file in the videos.txt format.
+
+    Args:
+        path: Where to write the video file.
+        size: How many videos to generate.
+        seed: The seed of the random titles and tags.
+    """
+    generator = random.Random(seed)
+    tags = [f"#{generator.choice(_WORDS)}{number}"
+            for number in range(_TAG_COUNT)]
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as video_file:
+        for number in range(size):
+            title = " ".join(
+                generator.choice(_WORDS).title()
+                for _ in range(generator.randint(2, 5)))
+            video_tags = generator.sample(tags, generator.randint(0, 3))
+            video_file.write(
+                f"{title} {number} | video_{number} | "
+                f"{', '.join(video_tags)}\n")
+
+
+class _Benchmark:
+    """A class used to represent one timed command.
+
+    Attributes:
+        name: The name the results are recorded under.
+        command: Called with the iteration number, returns the command to
+            time.
+        setup: Called with the parser and the iteration number before each
+            timed command, without being timed. None if not needed.
+    """
+
+    def __init__(self, name, command, setup=None):
+        self.name = name
+        self.command = command
+        self.setup = setup
+
+
+def _benchmarks(size, seed):
+    """Returns the benchmarks of every command for a catalog size."""
+    generator = random.Random(seed)
+    video_ids = [f"video_{number}" for number in range(size)]
+    generator.shuffle(video_ids)
+
+    def video_id(number):
+        return video_ids[number % size]
+
+    def word(number):
+        return _WORDS[number % len(_WORDS)]
+
+    def tag(number):
+        return f"#{word(number)}"
+
+    def fill_playlist(parser, number):
+        parser.execute_command(
+            ["ADD_MANY_TO_PLAYLIST", "bench_clear"]
+            + [video_id(number * _PLAYLIST_LENGTH + offset)
+               for offset in range(_PLAYLIST_LENGTH)])
+
+    return [
+        _Benchmark("NUMBER_OF_VIDEOS", lambda n: ["NUMBER_OF_VIDEOS"]),
+        _Benchmark("SHOW_ALL_VIDEOS", lambda n: ["SHOW_ALL_VIDEOS"]),
+        _Benchmark("SHOW_ALL_VIDEOS 50",
+                   lambda n: ["SHOW_ALL_VIDEOS", "50", video_id(n)]),
+        _Benchmark("PLAY", lambda n: ["PLAY", video_id(n)]),
+        _Benchmark("PLAY_RANDOM", lambda n: ["PLAY_RANDOM"]),
+        _Benchmark("PAUSE", lambda n: ["PAUSE"]),
+        _Benchmark("CONTINUE", lambda n: ["CONTINUE"]),
+        _Benchmark("SHOW_PLAYING", lambda n: ["SHOW_PLAYING"]),
+        _Benchmark("STOP", lambda n: ["STOP"]),
+        _Benchmark("CREATE_PLAYLIST",
+                   lambda n: ["CREATE_PLAYLIST", "bench_new"],
+                   setup=lambda parser, n: parser.execute_command(
+                       ["DELETE_PLAYLIST", "bench_new"])),
+        _Benchmark("DELETE_PLAYLIST",
+                   lambda n: ["DELETE_PLAYLIST", "bench_new"],
+                   setup=lambda parser, n: parser.execute_command(
+                       ["CREATE_PLAYLIST", "bench_new"])),
+        _Benchmark("ADD_TO_PLAYLIST",
+                   lambda n: ["ADD_TO_PLAYLIST", "bench_add", video_id(n)]),
+        _Benchmark("ADD_MANY_TO_PLAYLIST",
+                   lambda n: ["ADD_MANY_TO_PLAYLIST", "bench_many"]
+                   + [video_id(n * 10 + offset) for offset in range(10)]),
+        _Benchmark("SHOW_PLAYLIST",
+                   lambda n: ["SHOW_PLAYLIST",
+                              f"playlist_{n % _PLAYLIST_COUNT}"]),
+        _Benchmark("SHOW_ALL_PLAYLISTS", lambda n: ["SHOW_ALL_PLAYLISTS"]),
+        _Benchmark("REMOVE_FROM_PLAYLIST",
+                   lambda n: ["REMOVE_FROM_PLAYLIST", "bench_add",
+                              video_id(n)]),
+        _Benchmark("REMOVE_MANY_FROM_PLAYLIST",
+                   lambda n: ["REMOVE_MANY_FROM_PLAYLIST", "bench_many"]
+                   + [video_id(n * 10 + offset) for offset in range(10)]),
+        _Benchmark("CLEAR_PLAYLIST",
+                   lambda n: ["CLEAR_PLAYLIST", "bench_clear"],
+                   setup=fill_playlist),
+        _Benchmark("SEARCH_VIDEOS",
+                   lambda n: ["SEARCH_VIDEOS", word(n)]),
+        _Benchmark("SEARCH_VIDEOS 10",
+                   lambda n: ["SEARCH_VIDEOS", word(n), "10"]),
+        _Benchmark("SEARCH_VIDEOS COUNT",
+                   lambda n: ["SEARCH_VIDEOS", word(n), "COUNT"]),
+        _Benchmark("SEARCH_VIDEOS_WITH_TAG",
+                   lambda n: ["SEARCH_VIDEOS_WITH_TAG", tag(n)]),
+        _Benchmark("SEARCH_VIDEOS_WITH_TAG 10",
+                   lambda n: ["SEARCH_VIDEOS_WITH_TAG", tag(n), "10"]),
+        _Benchmark("PLAY_RESULT", lambda n: ["PLAY_RESULT", "1"]),
+        _Benchmark("FLAG_VIDEO",
+                   lambda n: ["FLAG_VIDEO", video_id(n), "benchmark"]),
+        _Benchmark("PLAY_RANDOM (flagged)", lambda n: ["PLAY_RANDOM"]),
+        _Benchmark("ALLOW_VIDEO", lambda n: ["ALLOW_VIDEO", video_id(n)]),
+        _Benchmark("HELP", lambda n: ["HELP"]),
+    ]
+
+
+def _time_benchmark(parser, benchmark, min_time, max_iterations):
+    """Times a benchmark until min_time has been spent or max_iterations
+    commands have run, running it at least _MIN_ITERATIONS times.
+
+    Returns:
+        The time of each execution, in seconds.
+    """
+    timings = []
+    spent = 0.0
+    while len(timings) < max_iterations and (
+            spent < min_time or len(timings) < _MIN_ITERATIONS):
+        iteration = len(timings)
+        if benchmark.setup is not None:
+            benchmark.setup(parser, iteration)
+        command = benchmark.command(iteration)
+        start = time.perf_counter()
+        parser.execute_command(command)
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        spent += elapsed
+    return timings
+
+
+def _summary(timings):
+    timings = sorted(timings)
+    return {
+        "iterations": len(timings),
+        "mean_us": statistics.fmean(timings) * 1e6,
+        "median_us": statistics.median(timings) * 1e6,
+        "min_us": timings[0] * 1e6,
+        "p95_us": timings[int(0.95 * (len(timings) - 1))] * 1e6,
+    }
+
+
+def run_benchmarks(size, directory, min_time=0.2, max_iterations=10000,
+                   seed=0, names=None):
+    """Benchmarks every command on a synthetic catalog.
+
+    Args:
+        size: How many videos the catalog has.
+        directory: Where to write the generated video file.
+        min_time: How many seconds to spend timing each command, unless
+            max_iterations is reached first. Each command runs at least
+            _MIN_ITERATIONS times, or max_iterations times if that is
+            fewer.
+        max_iterations: The most times each command is run.
+        seed: The seed of the catalog and of the command arguments.
+        names: The names of the benchmarks to run, all of them by default.
+
+    Returns:
+        A dictionary with the times taken to generate, load and first list
+        the catalog and, for each command, how many times it ran and its
+        mean, median, minimum and 95th percentile time in microseconds.
+    """
+    video_path = Path(directory) / f"videos_{size}.txt"
+    start = time.perf_counter()
+    generate_catalog(video_path, size, seed)
+    generate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    video_library = VideoLibrary(video_path)
+    video_library.freeze()
+    video_library.get_video_count()
+    load_seconds = time.perf_counter() - start
+
+    parser = CommandParser(VideoPlayer(
+        video_library, output=NullSink(), ask_to_play=False))
+    # The first listing renders every video once, which is timed
+    # separately from the repeated listings.
+    start = time.perf_counter()
+    parser.execute_command(["SHOW_ALL_VIDEOS"])
+    render_seconds = time.perf_counter() - start
+
+    generator = random.Random(seed)
+    for number in range(_PLAYLIST_COUNT):
+        parser.execute_command(["CREATE_PLAYLIST", f"playlist_{number}"])
+        parser.execute_command(
+            ["ADD_MANY_TO_PLAYLIST", f"playlist_{number}"]
+            + [f"video_{generator.randrange(size)}"
+               for _ in range(_PLAYLIST_LENGTH)])
+    for name in ("bench_add", "bench_many", "bench_clear"):
+        parser.execute_command(["CREATE_PLAYLIST", name])
+
+    commands = {}
+    for benchmark in _benchmarks(size, seed):
+        if names is not None and benchmark.name not in names:
+            continue
+        commands[benchmark.name] = _summary(_time_benchmark(
+            parser, benchmark, min_time, max_iterations))
+    return {
+        "videos": size,
+        "generate_seconds": generate_seconds,
+        "load_seconds": load_seconds,
+        "render_seconds": render_seconds,
+        "commands": commands,
+    }
+
+
+def _print_results(results):
+    print(f"{results['videos']:,} videos, loaded in "
+          f"{results['load_seconds']:.3f}s, first listed in "
+          f"{results['render_seconds']:.3f}s")
+    for name, summary in results["commands"].items():
+        print(f"  {name:<28} {summary['median_us']:>14,.1f} us median "
+              f"{summary['p95_us']:>14,.1f} us p95 "
+              f"({summary['iterations']} runs)")
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(
+        description="Times every simulator command on synthetic catalogs.")
+    argument_parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 100000, 1000000],
+        help="the catalog sizes to benchmark")
+    argument_parser.add_argument(
+        "--output", default="benchmark_results.json",
+        help="the JSON file the results are written to")
+    argument_parser.add_argument(
+        "--min-time", type=float, default=0.2,
+        help="seconds to spend timing each command")
+    argument_parser.add_argument(
+        "--max-iterations", type=int, default=10000,
+        help="the most times each command is run")
+    argument_parser.add_argument("--seed", type=int, default=0)
+    argument_parser.add_argument(
+        "--only", nargs="+", metavar="NAME",
+        help="only run the benchmarks with these names")
+    arguments = argument_parser.parse_args()
+
+    report = {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "min_time": arguments.min_time,
+        "max_iterations": arguments.max_iterations,
+        "seed": arguments.seed,
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for size in arguments.sizes:
+            results = run_benchmarks(
+                size, directory, arguments.min_time,
+                arguments.max_iterations, arguments.seed, arguments.only)
+            _print_results(results)
+            report["results"].append(results)
+    with open(arguments.output, "w", encoding="utf-8") as output_file:
+        json.dump(report, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """A command parser class."""
 
-import textwrap
+import functools
+import sys
 from typing import Sequence
 
 
@@ -12,8 +13,58 @@ class CommandException(Exception):
 class CommandParser:
     """A class used to parse and execute a user Command."""
 
+    # Maps each upper case command name to its handler, the numbers of
+    # arguments it accepts (None if its arguments are ignored), the
+    # message raised when it gets any other number of arguments and its
+    # HELP line, in the order HELP lists them. Registering replaces the
+    # dictionary rather than changing it, so the commands registered on a
+    # subclass are not added to its base classes.
+    _commands = {}
+
     def __init__(self, video_player):
         self._player = video_player
+        # The registered commands with their handlers bound to this parser
+        # or its player, so executing one is a single dictionary lookup.
+        self._handlers = {
+            name: (self._bind(handler), arities, usage)
+            for name, (handler, arities, usage, _) in self._commands.items()}
+
+    @property
+    def player(self):
+        return self._player
+
+    def _bind(self, handler):
+        if isinstance(handler, str):
+            return getattr(self._player, handler)
+        return functools.partial(handler, self)
+
+    @classmethod
+    def register_command(cls, name, handler, arities=None, usage=None,
+                         help=None):
+        """Registers a command, replacing any command with the same name.
+
+        The command is available to the parsers of this class and its
+        subclasses created after it is registered.
+
+        Args:
+            name: The command name, matched case insensitively.
+            handler: Called with the CommandParser followed by the command
+                arguments, or the name of the VideoPlayer method to call
+                with the command arguments.
+            arities: The numbers of arguments the command accepts, e.g.
+                (1, 2), or range(2, sys.maxsize) for at least two. None if
+                the command takes no arguments and ignores any it is given.
+            usage: The CommandException message used when the command gets
+                a number of arguments not in arities.
+            help: The line HELP shows for the command, e.g.
+                "PLAY <video_id> - Plays specified video.". The command
+                name followed by its usage by default.
+        """
+        name = name.upper()
+        if help is None:
+            help = name if usage is None else f"{name} - {usage}"
+        cls._commands = {
+            **cls._commands, name: (handler, arities, usage, help)}
 
     def execute_command(self, command: Sequence[str]):
         """Executes the user command. Expects the command to be upper case.
@@ -24,140 +75,133 @@ class CommandParser:
                 "Please enter a valid command, "
                 "type HELP for a list of available commands.")
 
-        if command[0].upper() == "NUMBER_OF_VIDEOS":
-            self._player.number_of_videos()
-
-        elif command[0].upper() == "SHOW_ALL_VIDEOS":
-            self._player.show_all_videos()
-
-        elif command[0].upper() == "PLAY":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter PLAY command followed by video_id.")
-            self._player.play_video(command[1])
-
-        elif command[0].upper() == "PLAY_RANDOM":
-            self._player.play_random_video()
-
-        elif command[0].upper() == "STOP":
-            self._player.stop_video()
-
-        elif command[0].upper() == "PAUSE":
-            self._player.pause_video()
-
-        elif command[0].upper() == "CONTINUE":
-            self._player.continue_video()
-
-        elif command[0].upper() == "SHOW_PLAYING":
-            self._player.show_playing()
-
-        elif command[0].upper() == "CREATE_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter CREATE_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.create_playlist(command[1])
-
-        elif command[0].upper() == "ADD_TO_PLAYLIST":
-            if len(command) != 3:
-                raise CommandException(
-                    "Please enter ADD_TO_PLAYLIST command followed by a "
-                    "playlist name and video_id to add.")
-            self._player.add_to_playlist(command[1], command[2])
-
-        elif command[0].upper() == "REMOVE_FROM_PLAYLIST":
-            if len(command) != 3:
-                raise CommandException(
-                    "Please enter REMOVE_FROM_PLAYLIST command followed by a "
-                    "playlist name and video_id to remove.")
-            self._player.remove_from_playlist(command[1], command[2])
-
-        elif command[0].upper() == "CLEAR_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter CLEAR_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.clear_playlist(command[1])
-
-        elif command[0].upper() == "DELETE_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter DELETE_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.delete_playlist(command[1])
-
-        elif command[0].upper() == "SHOW_PLAYLIST":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter SHOW_PLAYLIST command followed by a "
-                    "playlist name.")
-            self._player.show_playlist(command[1])
-
-        elif command[0].upper() == "SHOW_ALL_PLAYLISTS":
-            self._player.show_all_playlists()
-
-        elif command[0].upper() == "SEARCH_VIDEOS":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter SEARCH_VIDEOS command followed by a "
-                    "search term.")
-            self._player.search_videos(command[1])
-
-        elif command[0].upper() == "SEARCH_VIDEOS_WITH_TAG":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter SEARCH_VIDEOS_WITH_TAG command followed by a "
-                    "video tag.")
-            self._player.search_videos_tag(command[1])
-
-        elif command[0].upper() == "FLAG_VIDEO":
-            if len(command) == 3:
-                self._player.flag_video(command[1], command[2])
-            elif len(command) == 2:
-                self._player.flag_video(command[1])
-            else:
-                raise CommandException(
-                    "Please enter FLAG_VIDEO command followed by a "
-                    "video_id and an optional flag reason.")
-
-        elif command[0].upper() == "ALLOW_VIDEO":
-            if len(command) != 2:
-                raise CommandException(
-                    "Please enter ALLOW_VIDEO command followed by a "
-                    "video_id.")
-            self._player.allow_video(command[1])
-
-        elif command[0].upper() == "HELP":
-            self._get_help()
-        else:
-            print(
+        registered = self._handlers.get(command[0].upper())
+        if registered is None:
+            self._player.output.write(
                 "Please enter a valid command, type HELP for a list of "
-                "available commands.")
+                "available commands.\n")
+            return
+
+        handler, arities, usage = registered
+        if arities is None:
+            handler()
+        elif len(command) - 1 in arities:
+            handler(*command[1:])
+        else:
+            raise CommandException(usage)
 
     def _get_help(self):
         """Displays all available commands to the user."""
-        help_text = textwrap.dedent("""
-        Available commands:
-            NUMBER_OF_VIDEOS - Shows how many videos are in the library.
-            SHOW_ALL_VIDEOS - Lists all videos from the library.
-            PLAY <video_id> - Plays specified video.
-            PLAY_RANDOM - Plays a random video from the library.
-            STOP - Stop the current video.
-            PAUSE - Pause the current video.
-            CONTINUE - Resume the current paused video.
-            SHOW_PLAYING - Displays the title, url and paused status of the video that is currently playing (or paused).
-            CREATE_PLAYLIST <playlist_name> - Creates a new (empty) playlist with the provided name.
-            ADD_TO_PLAYLIST <playlist_name> <video_id> - Adds the requested video to the playlist.
-            REMOVE_FROM_PLAYLIST <playlist_name> <video_id> - Removes the specified video from the specified playlist
-            CLEAR_PLAYLIST <playlist_name> - Removes all the videos from the playlist.
-            DELETE_PLAYLIST <playlist_name> - Deletes the playlist.
-            SHOW_PLAYLIST <playlist_name> - List all the videos in this playlist.
-            SHOW_ALL_PLAYLISTS - Display all the available playlists.
-            SEARCH_VIDEOS <search_term> - Display all the videos whose titles contain the search_term.
-            SEARCH_VIDEOS_WITH_TAG <tag_name> -Display all videos whose tags contains the provided tag.
-            FLAG_VIDEO <video_id> <flag_reason> - Mark a video as flagged.
-            ALLOW_VIDEO <video_id> - Removes a flag from a video.
-            HELP - Displays help.
-            EXIT - Terminates the program execution.
-        """)
-        print(help_text)
+        help_lines = [line for _, _, _, line in self._commands.values()]
+        help_lines.append("EXIT - Terminates the program execution.")
+        self._player.output.write(
+            "\nAvailable commands:\n"
+            + "".join(f"    {line}\n" for line in help_lines) + "\n")
+
+
+CommandParser.register_command(
+    "NUMBER_OF_VIDEOS", "number_of_videos",
+    help="NUMBER_OF_VIDEOS - Shows how many videos are in the library.")
+CommandParser.register_command(
+    "SHOW_ALL_VIDEOS", "show_all_videos", (0, 1, 2),
+    "Please enter SHOW_ALL_VIDEOS command optionally followed by a "
+    "page size and a cursor.",
+    "SHOW_ALL_VIDEOS [page_size] [cursor] - Lists all videos from the "
+    "library, or one page of them.")
+CommandParser.register_command(
+    "PLAY", "play_video", (1,),
+    "Please enter PLAY command followed by video_id.",
+    "PLAY <video_id> - Plays specified video.")
+CommandParser.register_command(
+    "PLAY_RANDOM", "play_random_video",
+    help="PLAY_RANDOM - Plays a random video from the library.")
+CommandParser.register_command(
+    "STOP", "stop_video", help="STOP - Stop the current video.")
+CommandParser.register_command(
+    "PAUSE", "pause_video", help="PAUSE - Pause the current video.")
+CommandParser.register_command(
+    "CONTINUE", "continue_video",
+    help="CONTINUE - Resume the current paused video.")
+CommandParser.register_command(
+    "SHOW_PLAYING", "show_playing",
+    help="SHOW_PLAYING - Displays the title, url and paused status of the "
+         "video that is currently playing (or paused).")
+CommandParser.register_command(
+    "CREATE_PLAYLIST", "create_playlist", (1,),
+    "Please enter CREATE_PLAYLIST command followed by a playlist name.",
+    "CREATE_PLAYLIST <playlist_name> - Creates a new (empty) playlist with "
+    "the provided name.")
+CommandParser.register_command(
+    "ADD_TO_PLAYLIST", "add_to_playlist", (2,),
+    "Please enter ADD_TO_PLAYLIST command followed by a "
+    "playlist name and video_id to add.",
+    "ADD_TO_PLAYLIST <playlist_name> <video_id> - Adds the requested video "
+    "to the playlist.")
+CommandParser.register_command(
+    "ADD_MANY_TO_PLAYLIST", "add_many_to_playlist", range(2, sys.maxsize),
+    "Please enter ADD_MANY_TO_PLAYLIST command followed by a "
+    "playlist name and the video_ids (or @file of video_ids) to add.",
+    "ADD_MANY_TO_PLAYLIST <playlist_name> <video_id>... - Adds the "
+    "requested videos (or the ids listed in @file) to the playlist.")
+CommandParser.register_command(
+    "REMOVE_FROM_PLAYLIST", "remove_from_playlist", (2,),
+    "Please enter REMOVE_FROM_PLAYLIST command followed by a "
+    "playlist name and video_id to remove.",
+    "REMOVE_FROM_PLAYLIST <playlist_name> <video_id> - Removes the "
+    "specified video from the specified playlist")
+CommandParser.register_command(
+    "REMOVE_MANY_FROM_PLAYLIST", "remove_many_from_playlist",
+    range(2, sys.maxsize),
+    "Please enter REMOVE_MANY_FROM_PLAYLIST command followed by a "
+    "playlist name and the video_ids (or @file of video_ids) to remove.",
+    "REMOVE_MANY_FROM_PLAYLIST <playlist_name> <video_id>... - Removes the "
+    "specified videos (or the ids listed in @file) from the playlist.")
+CommandParser.register_command(
+    "CLEAR_PLAYLIST", "clear_playlist", (1,),
+    "Please enter CLEAR_PLAYLIST command followed by a playlist name.",
+    "CLEAR_PLAYLIST <playlist_name> - Removes all the videos from the "
+    "playlist.")
+CommandParser.register_command(
+    "DELETE_PLAYLIST", "delete_playlist", (1,),
+    "Please enter DELETE_PLAYLIST command followed by a playlist name.",
+    "DELETE_PLAYLIST <playlist_name> - Deletes the playlist.")
+CommandParser.register_command(
+    "SHOW_PLAYLIST", "show_playlist", (1, 2, 3),
+    "Please enter SHOW_PLAYLIST command followed by a playlist name, "
+    "optionally followed by a page size and a cursor.",
+    "SHOW_PLAYLIST <playlist_name> [page_size] [cursor] - List all the "
+    "videos in this playlist, or one page of them.")
+CommandParser.register_command(
+    "SHOW_ALL_PLAYLISTS", "show_all_playlists",
+    help="SHOW_ALL_PLAYLISTS - Display all the available playlists.")
+CommandParser.register_command(
+    "SEARCH_VIDEOS", "search_videos", (1, 2),
+    "Please enter SEARCH_VIDEOS command followed by a search term and "
+    "an optional limit or COUNT.",
+    "SEARCH_VIDEOS <search_term> [limit|COUNT] - Display all the videos "
+    "whose titles contain the search_term, only the first limit of them, "
+    "or only how many there are.")
+CommandParser.register_command(
+    "SEARCH_VIDEOS_WITH_TAG", "search_videos_tag", (1, 2),
+    "Please enter SEARCH_VIDEOS_WITH_TAG command followed by a video tag "
+    "and an optional limit or COUNT.",
+    "SEARCH_VIDEOS_WITH_TAG <tag_name> [limit|COUNT] -Display all videos "
+    "whose tags contains the provided tag, only the first limit of them, "
+    "or only how many there are.")
+CommandParser.register_command(
+    "PLAY_RESULT", "play_result", (1,),
+    "Please enter PLAY_RESULT command followed by the number of a "
+    "search result.",
+    "PLAY_RESULT <number> - Plays the video with that number in the "
+    "results of the last search.")
+CommandParser.register_command(
+    "FLAG_VIDEO", "flag_video", (1, 2),
+    "Please enter FLAG_VIDEO command followed by a "
+    "video_id and an optional flag reason.",
+    "FLAG_VIDEO <video_id> <flag_reason> - Mark a video as flagged.")
+CommandParser.register_command(
+    "ALLOW_VIDEO", "allow_video", (1,),
+    "Please enter ALLOW_VIDEO command followed by a video_id.",
+    "ALLOW_VIDEO <video_id> - Removes a flag from a video.")
+CommandParser.register_command(
+    "HELP", lambda parser: parser._get_help(), help="HELP - Displays help.")
@@ -0,0 +1,104 @@
+"""A flag store class."""
+
+
+class RowBitmap:
+    """A class used to represent a set of library rows as a bitmap.
+
+    The bitmap only grows as far as the highest row added, so a handful of
+    rows cost a handful of bytes however large the library is.
+    """
+
+    def __init__(self):
+        self._bits = bytearray()
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, row):
+        byte = row >> 3
+        return byte < len(self._bits) and bool(
+            self._bits[byte] & (1 << (row & 7)))
+
+    def add(self, row):
+        if row in self:
+            return
+        byte = row >> 3
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte + 1 - len(self._bits)))
+        self._bits[byte] |= 1 << (row & 7)
+        self._count += 1
+
+    def discard(self, row):
+        if row not in self:
+            return
+        self._bits[row >> 3] &= ~(1 << (row & 7))
+        self._count -= 1
+
+
+class FlagStore:
+    """A class used to hold the flagged videos of one player session.
+
+    Flags are a sparse overlay over a shared video library: only flagged
+    videos have an entry. Alongside the reasons, keyed by video id, the
+    library rows of the flagged videos are kept in a bitmap that library
+    searches use to skip flagged videos before building them. The suffix
+    listings append to a flagged video is rendered when it is flagged and
+    dropped when it is allowed, keyed by both video id and row.
+    """
+
+    def __init__(self):
+        self._reasons = {}
+        self._flagged_rows = RowBitmap()
+        self._suffixes = {}
+        self._row_suffixes = {}
+
+    def __len__(self):
+        return len(self._reasons)
+
+    def __contains__(self, video_id):
+        return video_id in self._reasons
+
+    @property
+    def flagged_rows(self):
+        return self._flagged_rows
+
+    def reason(self, video_id):
+        """Returns the flag reason of a video, None if it is not flagged."""
+        return self._reasons.get(video_id, None)
+
+    def suffix(self, video_id):
+        """Returns what listings append to a video, "" if it is not
+        flagged."""
+        return self._suffixes.get(video_id, "")
+
+    def row_suffix(self, row):
+        """Returns what listings append to the video at a library row, ""
+        if it is not flagged."""
+        return self._row_suffixes.get(row, "")
+
+    def flag(self, video_id, row, reason):
+        """Flags a video.
+
+        Args:
+            video_id: The video url.
+            row: The library row of the video.
+            reason: Why the video is flagged.
+        """
+        self._reasons[video_id] = reason
+        self._flagged_rows.add(row)
+        suffix = f" - FLAGGED (reason: {reason})"
+        self._suffixes[video_id] = suffix
+        self._row_suffixes[row] = suffix
+
+    def allow(self, video_id, row):
+        """Removes the flag from a video.
+
+        Args:
+            video_id: The video url.
+            row: The library row of the video.
+        """
+        self._reasons.pop(video_id, None)
+        self._flagged_rows.discard(row)
+        self._suffixes.pop(video_id, None)
+        self._row_suffixes.pop(row, None)
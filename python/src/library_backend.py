@@ -0,0 +1,118 @@
+"""The video library backend interface and its implementations."""
+
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Protocol, Sequence, Tuple
+from typing import runtime_checkable
+
+from .sqlite_video_library import SqliteVideoLibrary
+from .video import Video
+from .video_catalog import MappedVideoLibrary
+from .video_library import VideoLibrary
+
+_SOURCE_DIRECTORY = Path(__file__).parent
+
+
+@runtime_checkable
+class LibraryBackend(Protocol):
+    """A class used to represent the storage a video player reads from.
+
+    Rows are small integers identifying the videos for as long as they are
+    in the library. Searches are case insensitive and return the videos
+    sorted by title.
+    """
+
+    def get_video(self, video_id: str) -> Optional[Video]:
+        ...
+
+    def get_row(self, video_id: str) -> Optional[int]:
+        ...
+
+    def get_rows(self) -> Iterable[int]:
+        ...
+
+    def get_video_by_row(self, row: int) -> Video:
+        ...
+
+    def get_random_video(self) -> Optional[Video]:
+        ...
+
+    def get_all_videos(self) -> Sequence[Video]:
+        ...
+
+    def iter_sorted_videos(self, after: Optional[str] = None
+                           ) -> Iterator[Video]:
+        ...
+
+    def iter_sorted_details(self, after: Optional[str] = None
+                            ) -> Iterator[Tuple[int, str]]:
+        ...
+
+    def get_video_count(self) -> int:
+        ...
+
+    def search_titles(self, search_term: str, excluded_rows=(),
+                      limit: Optional[int] = None) -> Sequence[Video]:
+        ...
+
+    def count_titles(self, search_term: str, excluded_rows=()) -> int:
+        ...
+
+    def search_tags(self, video_tag: str, excluded_rows=(),
+                    limit: Optional[int] = None) -> Sequence[Video]:
+        ...
+
+    def count_tags(self, video_tag: str, excluded_rows=()) -> int:
+        ...
+
+
+def _open_memory(path):
+    if path is None:
+        return VideoLibrary.shared()
+    library = VideoLibrary(path)
+    library.freeze()
+    return library
+
+
+def _open_mmap(path):
+    return MappedVideoLibrary(
+        _SOURCE_DIRECTORY / "videos.cat" if path is None else path)
+
+
+def _open_sqlite(path):
+    return SqliteVideoLibrary(
+        _SOURCE_DIRECTORY / "videos.db" if path is None else path)
+
+
+# Backend kind -> function opening a library of that kind from a path.
+_BACKENDS = {
+    "memory": _open_memory,
+    "mmap": _open_mmap,
+    "sqlite": _open_sqlite,
+}
+
+BACKEND_KINDS = tuple(_BACKENDS)
+
+
+def open_library(kind="memory", path=None):
+    """Opens a video library with the given storage backend.
+
+    Args:
+        kind: "memory" to parse a videos.txt file into memory, "mmap" to map
+            a catalog compiled by video_catalog, or "sqlite" to query a
+            database imported by sqlite_video_library.
+        path: The file to open. By default, videos.txt, videos.cat or
+            videos.db next to this module. The default memory library is
+            the shared one.
+
+    Returns:
+        A read-only LibraryBackend.
+
+    Raises:
+        ValueError: The kind of backend is unknown.
+    """
+    opener = _BACKENDS.get(kind)
+    if opener is None:
+        raise ValueError(
+            f"Unknown library backend {kind!r}, expected one of "
+            f"{', '.join(BACKEND_KINDS)}")
+    return opener(path)
@@ -0,0 +1,77 @@
+"""Output sinks for the video player."""
+
+import sys
+
+
+class StreamSink:
+    """A class used to write output to a text stream.
+
+    Without a stream, output goes to whatever sys.stdout is at the time of
+    each write, like print() does.
+    """
+
+    def __init__(self, stream=None):
+        self._stream = stream
+
+    def write(self, text):
+        (self._stream or sys.stdout).write(text)
+
+    def flush(self):
+        (self._stream or sys.stdout).flush()
+
+
+class BufferedSink:
+    """A class used to write output to a text stream in large blocks.
+
+    Output is held back until at least buffer_size characters are pending
+    or flush() is called.
+    """
+
+    def __init__(self, stream, buffer_size=1 << 16):
+        self._stream = stream
+        self._buffer_size = buffer_size
+        self._pending = []
+        self._pending_size = 0
+
+    def write(self, text):
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._stream.write("".join(self._pending))
+            self._pending.clear()
+            self._pending_size = 0
+        self._stream.flush()
+
+
+class ListSink:
+    """A class used to collect output lines in memory."""
+
+    def __init__(self):
+        self._lines = []
+
+    @property
+    def lines(self):
+        return self._lines
+
+    def write(self, text):
+        self._lines.extend(text.splitlines())
+
+    def flush(self):
+        pass
+
+    def clear(self):
+        self._lines.clear()
+
+
+class NullSink:
+    """A class used to discard output."""
+
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
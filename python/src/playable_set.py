@@ -0,0 +1,55 @@
+"""A playable video set class."""
+
+from array import array
+import random
+
+# Marks a row that is not in the set in the row -> position array.
+_ABSENT = 0xFFFFFFFF
+
+
+class PlayableSet:
+    """A class used to pick uniformly random videos from a changing set.
+
+    The library rows in the set are packed into an array, and a second
+    array maps each row to its position in the first. Removing a row moves
+    the last row into its place, so adding, removing and picking a random
+    row all take constant time and picking allocates nothing.
+    """
+
+    def __init__(self, rows=()):
+        self._rows = array("I", rows)
+        self._positions = array("I", [_ABSENT]) * (
+            max(self._rows, default=-1) + 1)
+        for position, row in enumerate(self._rows):
+            self._positions[row] = position
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, row):
+        return row < len(self._positions) and self._positions[row] != _ABSENT
+
+    def add(self, row):
+        if row in self:
+            return
+        if row >= len(self._positions):
+            self._positions.extend(
+                array("I", [_ABSENT]) * (row + 1 - len(self._positions)))
+        self._positions[row] = len(self._rows)
+        self._rows.append(row)
+
+    def discard(self, row):
+        if row not in self:
+            return
+        position = self._positions[row]
+        last_row = self._rows.pop()
+        if last_row != row:
+            self._rows[position] = last_row
+            self._positions[last_row] = position
+        self._positions[row] = _ABSENT
+
+    def choice(self):
+        """Returns a random row of the set, None if the set is empty."""
+        if not self._rows:
+            return None
+        return self._rows[random.randrange(len(self._rows))]
@@ -0,0 +1,176 @@
+"""A playlist journal class."""
+
+import os
+from pathlib import Path
+
+# Journal record types, the first field of every record.
+CREATE = "C"
+DELETE = "D"
+ADD = "A"
+REMOVE = "R"
+CLEAR = "X"
+
+_JOURNAL_NAME = "playlists.journal"
+_SNAPSHOT_NAME = "playlists.snapshot"
+_BUFFER_SIZE = 1 << 20
+
+# Record type -> how many fields its records have.
+_FIELD_COUNTS = {CREATE: 2, DELETE: 2, ADD: 3, REMOVE: 3, CLEAR: 2}
+
+
+class PlaylistJournal:
+    """A class used to make the playlists of a player durable.
+
+    Every playlist change is appended to a journal file as one
+    tab-separated record. Once enough records have been appended, the
+    current playlists are written to a snapshot file, in the same record
+    format, and the journal starts again empty. Loading replays the
+    snapshot and then the journal one record at a time. Replaying records
+    that were already applied does not change the result, so a crash
+    between writing a snapshot and emptying the journal loses nothing. A
+    crash while appending can leave the last record incomplete; it is
+    dropped and cut off the journal when loading.
+    """
+
+    def __init__(self, directory, compact_every=100000):
+        """The PlaylistJournal class is initialized.
+
+        Args:
+            directory: Where the journal and snapshot files are kept.
+            compact_every: How many records to append before writing a new
+                snapshot.
+        """
+        self._directory = Path(directory)
+        self._compact_every = compact_every
+        self._records_since_snapshot = 0
+        self._journal_file = None
+        self._playlists = None
+
+    def replay(self, playlists, video_library):
+        """Loads the stored playlists and starts journaling changes.
+
+        Args:
+            playlists: The empty PlaylistRegistry to load the playlists
+                into. Its later changes must be passed to record().
+            video_library: The library the playlist videos are looked up
+                in. Videos that no longer exist are dropped.
+        """
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._playlists = playlists
+        _replay_file(self._directory / _SNAPSHOT_NAME, playlists,
+                     video_library)
+        journal_path = self._directory / _JOURNAL_NAME
+        self._records_since_snapshot, complete_size = _replay_file(
+            journal_path, playlists, video_library)
+        if journal_path.exists():
+            os.truncate(journal_path, complete_size)
+        self._journal_file = open(
+            journal_path, "a", encoding="utf-8", newline="")
+
+    def record(self, record_type, playlist_name, video_id=None):
+        """Appends a playlist change to the journal.
+
+        Args:
+            record_type: One of CREATE, DELETE, ADD, REMOVE or CLEAR.
+            playlist_name: The name of the changed playlist.
+            video_id: The added or removed video, for ADD and REMOVE.
+        """
+        fields = [record_type, playlist_name]
+        if video_id is not None:
+            fields.append(video_id)
+        self._journal_file.write("\t".join(fields) + "\n")
+        self._journal_file.flush()
+        self._records_since_snapshot += 1
+        if self._records_since_snapshot >= self._compact_every:
+            self.compact()
+
+    def record_many(self, record_type, playlist_name, video_ids):
+        """Appends the same change to several videos of a playlist with a
+        single flush.
+
+        Args:
+            record_type: ADD or REMOVE.
+            playlist_name: The name of the changed playlist.
+            video_ids: The added or removed videos.
+        """
+        self._journal_file.writelines(
+            f"{record_type}\t{playlist_name}\t{video_id}\n"
+            for video_id in video_ids)
+        self._journal_file.flush()
+        self._records_since_snapshot += len(video_ids)
+        if self._records_since_snapshot >= self._compact_every:
+            self.compact()
+
+    def compact(self):
+        """Writes the current playlists to the snapshot and empties the
+        journal."""
+        temporary_path = self._directory / (_SNAPSHOT_NAME + ".tmp")
+        with open(temporary_path, "w", encoding="utf-8", newline="",
+                  buffering=_BUFFER_SIZE) as snapshot_file:
+            for playlist in self._playlists.sorted_playlists():
+                snapshot_file.write(f"{CREATE}\t{playlist.name}\n")
+                snapshot_file.writelines(
+                    f"{ADD}\t{playlist.name}\t{video.video_id}\n"
+                    for video in playlist.videos)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, self._directory / _SNAPSHOT_NAME)
+        self._journal_file.seek(0)
+        self._journal_file.truncate()
+        self._records_since_snapshot = 0
+
+    def close(self):
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+
+
+def _replay_file(path, playlists, video_library):
+    """Applies the records of a journal or snapshot file.
+
+    Records with an unknown type or the wrong number of fields are skipped,
+    and so is a last line without a newline, which a crash left incomplete.
+
+    Returns:
+        How many records the file has, and the size in bytes of its
+        complete lines.
+    """
+    records = complete_size = 0
+    if not path.exists():
+        return records, complete_size
+    # Newlines are not translated and undecodable bytes are kept as
+    # surrogates, so that re-encoding a line gives back its exact size.
+    with open(path, encoding="utf-8", errors="surrogateescape", newline="",
+              buffering=_BUFFER_SIZE) as file:
+        for line in file:
+            if not line.endswith("\n"):
+                break
+            complete_size += len(line.encode("utf-8", "surrogateescape"))
+            records += 1
+            # Files written in text mode on Windows end lines with "\r\n".
+            record = line.rstrip("\r\n").split("\t")
+            if _FIELD_COUNTS.get(record[0]) == len(record):
+                _apply(record, playlists, video_library)
+    return records, complete_size
+
+
+def _apply(record, playlists, video_library):
+    """Applies one well-formed journal record to a PlaylistRegistry."""
+    record_type, playlist_name, *video_id = record
+    if record_type == CREATE:
+        playlists.create(playlist_name)
+        return
+    if record_type == DELETE:
+        playlists.delete(playlist_name)
+        return
+    playlist = playlists.get(playlist_name)
+    if playlist is None:
+        return
+    if record_type == CLEAR:
+        playlist.clear()
+    elif record_type == ADD:
+        video = video_library.get_video(video_id[0])
+        if video is not None:
+            playlist.add_video(video)
+    elif record_type == REMOVE:
+        playlist.delete_video(video_id[0])
@@ -0,0 +1,65 @@
+"""A playlist registry class."""
+
+import bisect
+
+from .video_playlist import Playlist
+
+
+class PlaylistRegistry:
+    """A class used to look up playlists by case-insensitive name.
+
+    Playlists are keyed by their casefolded name, so looking one up,
+    creating one and deleting one do not depend on how many playlists
+    exist. The display names are also kept sorted so listing the playlists
+    never needs a sort.
+    """
+
+    def __init__(self):
+        self._playlists = {}
+        self._sorted_names = []
+
+    def __len__(self):
+        return len(self._playlists)
+
+    def __contains__(self, playlist_name):
+        return playlist_name.casefold() in self._playlists
+
+    def get(self, playlist_name):
+        """Returns the playlist with the given name, ignoring case.
+
+        Returns:
+            The Playlist, or None if no playlist has that name.
+        """
+        return self._playlists.get(playlist_name.casefold(), None)
+
+    def create(self, playlist_name):
+        """Creates an empty playlist.
+
+        Returns:
+            The new Playlist, or None if a playlist with the same name
+            (ignoring case) already exists.
+        """
+        key = playlist_name.casefold()
+        if key in self._playlists:
+            return None
+        playlist = Playlist(playlist_name)
+        self._playlists[key] = playlist
+        bisect.insort(self._sorted_names, playlist_name)
+        return playlist
+
+    def delete(self, playlist_name):
+        """Deletes the playlist with the given name, ignoring case.
+
+        Returns:
+            The deleted Playlist, or None if no playlist has that name.
+        """
+        playlist = self._playlists.pop(playlist_name.casefold(), None)
+        if playlist is not None:
+            position = bisect.bisect_left(self._sorted_names, playlist.name)
+            del self._sorted_names[position]
+        return playlist
+
+    def sorted_playlists(self):
+        """Iterates over the playlists sorted by display name."""
+        for playlist_name in self._sorted_names:
+            yield self._playlists[playlist_name.casefold()]
@@ -1,14 +1,24 @@
 """A youtube terminal simulator."""
+import argparse
+import sys
+import time
+
 from .video_player import VideoPlayer
 from .command_parser import CommandException
 from .command_parser import CommandParser
+from .library_backend import BACKEND_KINDS
+from .library_backend import open_library
+from .output_sink import BufferedSink
+from .playlist_journal import PlaylistJournal
 
+# Size of the output buffer used in batch mode.
+_BATCH_OUTPUT_BUFFER_SIZE = 1 << 20
 
-if __name__ == "__main__":
+
+def run_interactive(parser):
+    """Reads commands from the user one at a time until EXIT."""
     print("""Hello and welcome to YouTube, what would you like to do?
     Enter HELP for list of available commands or EXIT to terminate.""")
-    video_player = VideoPlayer()
-    parser = CommandParser(video_player)
     while True:
         command = input("YT> ")
         if command.upper() == "EXIT":
@@ -19,3 +29,89 @@ if __name__ == "__main__":
             print(e)
     print("YouTube has now terminated its execution. "
           "Thank you and goodbye!")
+
+
+def run_batch(parser, command_file):
+    """Executes every command in a file without prompting.
+
+    Blank lines are skipped and EXIT stops the batch early. The player
+    should be created with ask_to_play=False, so that searches do not wait
+    for an answer and the file plays search results with PLAY_RESULT.
+
+    Args:
+        parser: The CommandParser to execute the commands with.
+        command_file: A text file object with one command per line.
+
+    Returns:
+        The number of commands executed.
+    """
+    executed = 0
+    for line in command_file:
+        command = line.split()
+        if not command:
+            continue
+        if command[0].upper() == "EXIT":
+            break
+        try:
+            parser.execute_command(command)
+        except CommandException as e:
+            parser.player.output.write(f"{e}\n")
+        executed += 1
+    return executed
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument(
+        "--batch", metavar="FILE",
+        help="execute the commands in FILE ('-' for stdin) without "
+             "prompting, then report the throughput on stderr")
+    argument_parser.add_argument(
+        "--playlists", metavar="DIR",
+        help="keep the playlists in DIR across runs")
+    argument_parser.add_argument(
+        "--library", choices=BACKEND_KINDS, default="memory",
+        help="the storage backend of the video library")
+    argument_parser.add_argument(
+        "--library-path", metavar="PATH",
+        help="the file the library is opened from, next to the sources by "
+             "default")
+    arguments = argument_parser.parse_args()
+
+    journal = None
+    if arguments.playlists is not None:
+        journal = PlaylistJournal(arguments.playlists)
+    try:
+        _run(arguments, journal)
+    finally:
+        if journal is not None:
+            journal.close()
+
+
+def _run(arguments, journal):
+    video_library = open_library(arguments.library, arguments.library_path)
+    if arguments.batch is None:
+        run_interactive(CommandParser(
+            VideoPlayer(video_library, playlist_journal=journal)))
+        return
+
+    if arguments.batch == "-":
+        command_file = sys.stdin
+    else:
+        command_file = open(arguments.batch, buffering=1 << 20)
+    output = BufferedSink(sys.stdout, _BATCH_OUTPUT_BUFFER_SIZE)
+    parser = CommandParser(VideoPlayer(
+        video_library, output=output, playlist_journal=journal,
+        ask_to_play=False))
+    start = time.perf_counter()
+    with command_file:
+        executed = run_batch(parser, command_file)
+    output.flush()
+    elapsed = time.perf_counter() - start
+    print(f"Executed {executed} commands in {elapsed:.3f}s "
+          f"({executed / elapsed if elapsed else 0:,.0f} commands/sec)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
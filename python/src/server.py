@@ -0,0 +1,164 @@
+"""A youtube simulator network server.
+
+Clients connect over TCP or a Unix socket and type the same commands as in
+the terminal simulator, one per line. Every connection gets its own
+VideoPlayer, while all of them share one VideoLibrary. After the greeting
+and after the output of each command the server sends the "YT> " prompt,
+so a client knows when a response is complete.
+
+The sessions run as asyncio tasks on a single thread. Searches do not ask
+which result to play, because the player cannot wait for the client
+without blocking every other session; clients send PLAY_RESULT instead.
+"""
+import argparse
+import asyncio
+import functools
+import traceback
+
+from .command_parser import CommandException
+from .command_parser import CommandParser
+from .library_backend import BACKEND_KINDS
+from .library_backend import open_library
+from .video_library import VideoLibrary
+from .video_player import VideoPlayer
+
+PROMPT = "YT> "
+GREETING = ("Hello and welcome to YouTube, what would you like to do?\n"
+            "Enter HELP for list of available commands or EXIT to "
+            "terminate.\n")
+GOODBYE = "YouTube has now terminated its execution. Thank you and goodbye!\n"
+
+# The longest command line a client may send, in bytes. Longer lines are
+# skipped and reported instead of executed.
+LINE_LIMIT = 1 << 20
+
+
+class _StreamWriterSink:
+    """An output sink writing to an asyncio StreamWriter.
+
+    StreamWriter.write never blocks; the session drains the writer after
+    each command instead.
+    """
+
+    def __init__(self, writer):
+        self._writer = writer
+
+    def write(self, text):
+        self._writer.write(text.encode("utf-8"))
+
+    def flush(self):
+        pass
+
+
+async def _read_line(reader):
+    """Reads the next line from a client.
+
+    Returns:
+        The line, empty at the end of the stream, or None if the line was
+        longer than the reader's limit and has been skipped.
+    """
+    too_long = False
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            line = e.partial
+        except asyncio.LimitOverrunError as e:
+            # Nothing is consumed from the reader, so skip the part of the
+            # line that was looked at and keep looking for its end.
+            await reader.readexactly(e.consumed)
+            too_long = True
+            continue
+        return None if too_long else line
+
+
+async def _run_session(video_library, reader, writer):
+    """Runs the commands of one connection until EXIT or disconnection."""
+    output = _StreamWriterSink(writer)
+    parser = CommandParser(
+        VideoPlayer(video_library, output=output, ask_to_play=False,
+                    id_files=False))
+    output.write(GREETING + PROMPT)
+    try:
+        while True:
+            await writer.drain()
+            line = await _read_line(reader)
+            if line is None:
+                output.write(f"Cannot execute command: Line is longer than "
+                             f"{LINE_LIMIT} bytes\n{PROMPT}")
+                continue
+            if not line:
+                break
+            command = line.decode("utf-8", errors="replace").split()
+            if command and command[0].upper() == "EXIT":
+                output.write(GOODBYE)
+                await writer.drain()
+                break
+            if command:
+                try:
+                    parser.execute_command(command)
+                except CommandException as e:
+                    output.write(f"{e}\n")
+                except Exception:
+                    # A bug in one command must not end the session, nor
+                    # every other session on the event loop.
+                    traceback.print_exc()
+                    output.write("Cannot execute command: Internal error\n")
+            output.write(PROMPT)
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(video_library=None, host="127.0.0.1", port=8765,
+                       unix_path=None):
+    """Starts serving player sessions.
+
+    Args:
+        video_library: The LibraryBackend shared by all the sessions,
+            VideoLibrary.shared() by default. It is fully loaded before the
+            server starts.
+        host: The address to listen on for TCP connections.
+        port: The TCP port to listen on, 0 for any free port.
+        unix_path: Listen on this Unix socket path instead of TCP.
+
+    Returns:
+        The started asyncio Server.
+    """
+    if video_library is None:
+        video_library = VideoLibrary.shared()
+    video_library.get_video_count()
+    handler = functools.partial(_run_session, video_library)
+    if unix_path is not None:
+        return await asyncio.start_unix_server(
+            handler, path=unix_path, limit=LINE_LIMIT)
+    return await asyncio.start_server(handler, host, port, limit=LINE_LIMIT)
+
+
+async def _serve_forever(arguments):
+    server = await start_server(
+        open_library(arguments.library, arguments.library_path),
+        host=arguments.host, port=arguments.port, unix_path=arguments.unix)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(
+        description="Serves youtube simulator sessions over the network.")
+    argument_parser.add_argument("--host", default="127.0.0.1")
+    argument_parser.add_argument("--port", type=int, default=8765)
+    argument_parser.add_argument(
+        "--unix", metavar="PATH", help="listen on a Unix socket instead")
+    argument_parser.add_argument(
+        "--library", choices=BACKEND_KINDS, default="memory",
+        help="the storage backend of the video library")
+    argument_parser.add_argument(
+        "--library-path", metavar="PATH",
+        help="the file the library is opened from, next to the sources by "
+             "default")
+    try:
+        asyncio.run(_serve_forever(argument_parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
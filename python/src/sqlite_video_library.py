@@ -0,0 +1,376 @@
+"""A video library backed by a SQLite database.
+
+The database holds one row per video, the distinct tags, and the tags of
+each video in order:
+
+    videos      row, video id and title, indexed by id and by title
+    tags        tag id, tag and lower-cased tag, indexed by lower-cased tag
+    video_tags  row, position and tag id, indexed by tag id
+    video_titles
+                an FTS5 trigram index over the titles, when the SQLite
+                library supports it
+
+Nothing is held in memory beyond the rows of the current query, so the
+catalog can be larger than memory.
+"""
+
+import argparse
+import itertools
+import random
+import sqlite3
+from pathlib import Path
+
+from .video import Video
+from .video_library import read_video_batches
+
+# Listing commands read the videos from the database this many at a time.
+_PAGE_SIZE = 1000
+
+# Length of the trigrams indexed by the FTS5 title index. Shorter queries
+# fall back to a scan of the titles.
+_NGRAM_SIZE = 3
+
+_SCHEMA = """
+CREATE TABLE videos (
+    row INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL
+);
+CREATE INDEX videos_by_title ON videos (title);
+CREATE TABLE tags (
+    tag_id INTEGER PRIMARY KEY,
+    tag TEXT NOT NULL UNIQUE,
+    lower_tag TEXT NOT NULL
+);
+CREATE INDEX tags_by_lower_tag ON tags (lower_tag);
+CREATE TABLE video_tags (
+    row INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    tag_id INTEGER NOT NULL,
+    PRIMARY KEY (row, position)
+) WITHOUT ROWID;
+CREATE INDEX video_tags_by_tag ON video_tags (tag_id, row);
+"""
+
+_TITLE_INDEX_SCHEMA = """
+CREATE VIRTUAL TABLE video_titles USING fts5(
+    title, content='videos', content_rowid='row', tokenize='trigram');
+INSERT INTO video_titles (video_titles) VALUES ('rebuild');
+"""
+
+
+def import_videos(source_path, database_path):
+    """Imports a pipe-delimited video file into a new SQLite database.
+
+    The video file is read in batches, so it does not need to fit in
+    memory. A video listed again replaces the earlier one but keeps its
+    row, so the rows are numbered from 1 to the number of videos in the
+    order the videos first appear.
+
+    Args:
+        source_path: The video file to import, in the videos.txt format.
+        database_path: Where to write the database. An existing file is
+            replaced.
+    """
+    database_path = Path(database_path)
+    database_path.unlink(missing_ok=True)
+    connection = sqlite3.connect(database_path)
+    try:
+        with connection:
+            connection.executescript(_SCHEMA)
+            tag_ids = {}
+            for batch in read_video_batches(source_path):
+                for title, video_id, tags in batch:
+                    _import_video(connection, tag_ids, title, video_id, tags)
+            try:
+                connection.executescript(_TITLE_INDEX_SCHEMA)
+            except sqlite3.OperationalError:
+                # Built without FTS5 or its trigram tokenizer; title
+                # searches scan the titles instead.
+                pass
+    finally:
+        connection.close()
+
+
+def _import_video(connection, tag_ids, title, video_id, tags):
+    existing = connection.execute(
+        "SELECT row FROM videos WHERE video_id = ?", (video_id,)).fetchone()
+    if existing is None:
+        row = connection.execute(
+            "INSERT INTO videos (video_id, title) VALUES (?, ?)",
+            (video_id, title)).lastrowid
+    else:
+        row, = existing
+        connection.execute(
+            "UPDATE videos SET title = ? WHERE row = ?", (title, row))
+        connection.execute("DELETE FROM video_tags WHERE row = ?", (row,))
+    for position, tag in enumerate(tags):
+        tag_id = tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = connection.execute(
+                "INSERT INTO tags (tag, lower_tag) VALUES (?, ?)",
+                (tag, tag.lower())).lastrowid
+            tag_ids[tag] = tag_id
+        connection.execute(
+            "INSERT INTO video_tags (row, position, tag_id) VALUES (?, ?, ?)",
+            (row, position, tag_id))
+
+
+class SqliteVideoLibrary:
+    """A class used to represent a Video Library backed by a SQLite file.
+
+    The database is opened read-only. Videos are read from it as they are
+    requested, and listings are read a page at a time in title order using
+    the title index.
+    """
+
+    def __init__(self, database_path):
+        """The SqliteVideoLibrary class is initialized.
+
+        Args:
+            database_path: A database written by import_videos.
+        """
+        self._connection = sqlite3.connect(
+            Path(database_path).resolve().as_uri() + "?mode=ro", uri=True)
+        # SQLite's lower() only folds ASCII letters.
+        self._connection.create_function(
+            "py_lower", 1, str.lower, deterministic=True)
+        self._count, = self._connection.execute(
+            "SELECT count(*) FROM videos").fetchone()
+        self._has_title_index = self._connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'video_titles'"
+        ).fetchone() is not None
+
+    def close(self):
+        """Closes the database."""
+        self._connection.close()
+
+    def _videos(self, records):
+        """Returns Video objects for (row, video_id, title) records.
+
+        The tags of all the records are read with one query.
+        """
+        records = list(records)
+        tags = {row: [] for row, _, _ in records}
+        if records:
+            placeholders = ",".join("?" * len(records))
+            for row, tag in self._connection.execute(
+                    "SELECT video_tags.row, tags.tag FROM video_tags "
+                    "JOIN tags USING (tag_id) "
+                    f"WHERE video_tags.row IN ({placeholders}) "
+                    "ORDER BY video_tags.row, video_tags.position",
+                    list(tags)):
+                tags[row].append(tag)
+        return [Video(title, video_id, tags[row])
+                for row, video_id, title in records]
+
+    def _paged_videos(self, records, excluded_rows=(), limit=None):
+        """Yields the videos of (row, video_id, title) records a page at a
+        time, except for the excluded rows.
+
+        Records are only fetched from the query until the limit is
+        reached.
+        """
+        if excluded_rows:
+            records = (
+                record for record in records
+                if record[0] not in excluded_rows)
+        page = []
+        for record in itertools.islice(records, limit):
+            page.append(record)
+            if len(page) == _PAGE_SIZE:
+                yield from self._videos(page)
+                page = []
+        yield from self._videos(page)
+
+    def get_row(self, video_id):
+        """Returns the row number of a video, None if it does not exist."""
+        record = self._connection.execute(
+            "SELECT row FROM videos WHERE video_id = ?",
+            (video_id,)).fetchone()
+        return None if record is None else record[0]
+
+    def get_video_count(self):
+        """Returns the number of videos in the library."""
+        return self._count
+
+    def get_rows(self):
+        """Returns the row numbers of all the videos."""
+        return range(1, self._count + 1)
+
+    def get_video_by_row(self, row):
+        """Returns the video at a row returned by get_row or get_rows."""
+        return self._videos(self._connection.execute(
+            "SELECT row, video_id, title FROM videos WHERE row = ?",
+            (row,)))[0]
+
+    def get_random_video(self):
+        """Returns a uniformly random video, None if the library is empty."""
+        if not self._count:
+            return None
+        return self.get_video_by_row(random.randint(1, self._count))
+
+    def get_all_videos(self):
+        """Returns all available video information from the video library."""
+        return list(self._paged_videos(self._connection.execute(
+            "SELECT row, video_id, title FROM videos ORDER BY row")))
+
+    def iter_sorted_videos(self, after=None):
+        """Iterates over the videos in title order.
+
+        Args:
+            after: The id of the video to start after, instead of starting
+                from the first video. Nothing is returned if it does not
+                exist.
+        """
+        for page in self._sorted_pages(after):
+            yield from self._videos(page)
+
+    def iter_sorted_details(self, after=None):
+        """Iterates over the rendered videos in title order.
+
+        The videos are rendered as they are read instead of being kept, so
+        the memory used does not grow with the catalog.
+
+        Args:
+            after: The id of the video to start after, instead of starting
+                from the first video. Nothing is returned if it does not
+                exist.
+
+        Returns:
+            An iterator over the (row, details) pairs of the videos.
+        """
+        for page in self._sorted_pages(after):
+            for (row, _, _), video in zip(page, self._videos(page)):
+                yield row, video.details
+
+    def _sorted_pages(self, after):
+        """Yields the (row, video_id, title) records of the videos in title
+        order, a page at a time.
+
+        Each page is a separate query that continues from the last title
+        and row of the previous page, so no cursor is left open between
+        pages and the whole listing is never held in memory.
+        """
+        if after is None:
+            page = self._connection.execute(
+                "SELECT row, video_id, title FROM videos "
+                "ORDER BY title, row LIMIT ?", (_PAGE_SIZE,)).fetchall()
+        else:
+            page = self._connection.execute(
+                "SELECT row, video_id, title FROM videos "
+                "WHERE (title, row) > "
+                "(SELECT title, row FROM videos WHERE video_id = ?) "
+                "ORDER BY title, row LIMIT ?", (after, _PAGE_SIZE)).fetchall()
+        while page:
+            yield page
+            last_row, _, last_title = page[-1]
+            page = self._connection.execute(
+                "SELECT row, video_id, title FROM videos "
+                "WHERE (title, row) > (?, ?) ORDER BY title, row LIMIT ?",
+                (last_title, last_row, _PAGE_SIZE)).fetchall()
+
+    def get_video(self, video_id):
+        """Returns the video object (title, url, tags) from the video library.
+
+        Args:
+            video_id: The video url.
+
+        Returns:
+            The Video object for the requested video_id. None if the video
+            does not exist.
+        """
+        videos = self._videos(self._connection.execute(
+            "SELECT row, video_id, title FROM videos WHERE video_id = ?",
+            (video_id,)))
+        return videos[0] if videos else None
+
+    def search_titles(self, search_term, excluded_rows=(), limit=None):
+        """Returns the videos whose titles contain the search term.
+
+        The match is case insensitive and the videos are returned sorted by
+        title. Terms of at least three characters are looked up in the FTS5
+        trigram index; shorter terms scan the titles in title order.
+
+        Args:
+            search_term: The substring to look for in the video titles.
+            excluded_rows: The rows of videos to leave out of the results.
+            limit: The most videos to return, all of them by default.
+        """
+        return list(self._paged_videos(
+            self._title_matches(search_term), excluded_rows, limit))
+
+    def count_titles(self, search_term, excluded_rows=()):
+        """Returns how many videos search_titles would return, without
+        building them."""
+        return sum(1 for row, _, _ in self._title_matches(search_term)
+                   if row not in excluded_rows)
+
+    def _title_matches(self, search_term):
+        """Returns the (row, video_id, title) records of the titles
+        containing the search term, in title order."""
+        search_term = search_term.lower()
+        if self._has_title_index and len(search_term) >= _NGRAM_SIZE:
+            records = self._connection.execute(
+                "SELECT videos.row, videos.video_id, videos.title "
+                "FROM video_titles JOIN videos "
+                "ON videos.row = video_titles.rowid "
+                "WHERE video_titles MATCH ? ORDER BY videos.title, videos.row",
+                ('"' + search_term.replace('"', '""') + '"',))
+            # The trigram tokenizer folds case differently from str.lower
+            # for a few characters, so each candidate is still checked.
+            return (
+                record for record in records
+                if search_term in record[2].lower())
+        return self._connection.execute(
+            "SELECT row, video_id, title FROM videos "
+            "WHERE instr(py_lower(title), ?) > 0 ORDER BY title, row",
+            (search_term,))
+
+    def search_tags(self, video_tag, excluded_rows=(), limit=None):
+        """Returns the videos with a tag containing the given tag.
+
+        The match is case insensitive, each video is returned once and the
+        videos are returned sorted by title. A tag starting with "#" is
+        matched as a prefix with a range scan of the tag index.
+
+        Args:
+            video_tag: The (possibly partial) tag to look for, e.g. "#ca".
+            excluded_rows: The rows of videos to leave out of the results.
+            limit: The most videos to return, all of them by default.
+        """
+        return list(self._paged_videos(
+            self._tag_matches(video_tag), excluded_rows, limit))
+
+    def count_tags(self, video_tag, excluded_rows=()):
+        """Returns how many videos search_tags would return, without
+        building them."""
+        return sum(1 for row, _, _ in self._tag_matches(video_tag)
+                   if row not in excluded_rows)
+
+    def _tag_matches(self, video_tag):
+        """Returns the (row, video_id, title) records of the videos with a
+        tag containing the given tag, in title order."""
+        video_tag = video_tag.lower()
+        if video_tag.startswith("#"):
+            tag_filter = "lower_tag >= ? AND lower_tag < ?"
+            parameters = (video_tag, video_tag + "\U0010ffff")
+        else:
+            tag_filter = "instr(lower_tag, ?) > 0"
+            parameters = (video_tag,)
+        return self._connection.execute(
+            "SELECT row, video_id, title FROM videos WHERE row IN ("
+            "SELECT video_tags.row FROM video_tags WHERE video_tags.tag_id IN "
+            f"(SELECT tag_id FROM tags WHERE {tag_filter})) "
+            "ORDER BY title, row", parameters)
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(
+        description="Imports a video file into a SQLite video library.")
+    argument_parser.add_argument(
+        "source", nargs="?", default=Path(__file__).parent / "videos.txt")
+    argument_parser.add_argument(
+        "database", nargs="?", default=Path(__file__).parent / "videos.db")
+    arguments = argument_parser.parse_args()
+    import_videos(arguments.source, arguments.database)
@@ -0,0 +1,33 @@
+"""A tag dictionary class."""
+
+
+class TagDictionary:
+    """A class used to intern tags as small integer ids.
+
+    Ids are handed out in the order tags are first seen, starting from 0,
+    so they can index plain lists and be stored in arrays.
+    """
+
+    def __init__(self):
+        self._tags = []
+        self._tag_ids = {}
+
+    def __len__(self):
+        return len(self._tags)
+
+    def intern(self, tag):
+        """Returns the id of a tag, giving it a new id if it has none yet."""
+        tag_id = self._tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = len(self._tags)
+            self._tags.append(tag)
+            self._tag_ids[tag] = tag_id
+        return tag_id
+
+    def tag_id(self, tag):
+        """Returns the id of a tag, None if the tag was never interned."""
+        return self._tag_ids.get(tag, None)
+
+    def tag(self, tag_id):
+        """Returns the tag with the given id."""
+        return self._tags[tag_id]
@@ -6,6 +6,8 @@ from typing import Sequence
 class Video:
     """A class used to represent a Video."""
 
+    __slots__ = ("_title", "_video_id", "_tags", "_details")
+
     def __init__(self, video_title: str, video_id: str, video_tags: Sequence[str]):
         """Video constructor."""
         self._title = video_title
@@ -14,6 +16,7 @@ class Video:
         # Turn the tags into a tuple here so it's unmodifiable,
         # in case the caller changes the 'video_tags' they passed to us
         self._tags = tuple(video_tags)
+        self._details = None
 
     @property
     def title(self) -> str:
@@ -29,3 +32,19 @@ class Video:
     def tags(self) -> Sequence[str]:
         """Returns the list of tags of a video."""
         return self._tags
+
+    @property
+    def details(self) -> str:
+        """Returns the video as "title (video_id) [tags]".
+
+        The string is rendered on first use and kept with the video.
+        """
+        if self._details is None:
+            self._details = render_details(
+                self._title, self._video_id, self._tags)
+        return self._details
+
+
+def render_details(title: str, video_id: str, tags: Sequence[str]) -> str:
+    """Returns a video rendered as "title (video_id) [tags]"."""
+    return f"{title} ({video_id}) [{' '.join(tags)}]"
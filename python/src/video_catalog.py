@@ -0,0 +1,302 @@
+"""A compiled, memory-mapped video catalog.
+
+The catalog is a binary version of videos.txt that can be opened without
+parsing it. All the sections after the header are fixed-width records,
+and every string is an (offset, length) reference into the string table
+at the end of the file:
+
+    header      magic, number of videos, number of tag references
+    videos      title, id and tag list references, sorted by title
+    id index    video record numbers, sorted by video id
+    tags        tag references, in video order
+    strings     utf-8 encoded titles, ids and tags, each stored once
+"""
+
+import argparse
+import itertools
+import mmap
+import random
+import struct
+from pathlib import Path
+
+from .video import Video
+from .video_library import VideoLibrary
+
+_MAGIC = b"YTCAT001"
+_HEADER = struct.Struct("<8sII")
+# title offset, title length, id offset, id length, first tag, tag count
+_VIDEO_RECORD = struct.Struct("<IIIIII")
+_INDEX_ENTRY = struct.Struct("<I")
+_STRING_REF = struct.Struct("<II")
+
+
+class CatalogError(Exception):
+    """A class used to represent an unreadable catalog file."""
+    pass
+
+
+def compile_catalog(source_path, catalog_path):
+    """Compiles a pipe-delimited video file into a binary catalog.
+
+    Args:
+        source_path: The video file to compile, in the videos.txt format.
+        catalog_path: Where to write the compiled catalog.
+    """
+    videos = sorted(
+        VideoLibrary(source_path).get_all_videos(),
+        key=lambda video: video.title)
+
+    strings = bytearray()
+    string_offsets = {}
+
+    def add_string(text):
+        data = text.encode("utf-8")
+        offset = string_offsets.get(data)
+        if offset is None:
+            offset = len(strings)
+            string_offsets[data] = offset
+            strings.extend(data)
+        return offset, len(data)
+
+    records = []
+    tag_refs = []
+    for video in videos:
+        title_ref = add_string(video.title)
+        id_ref = add_string(video.video_id)
+        first_tag = len(tag_refs)
+        tag_refs.extend(add_string(tag) for tag in video.tags)
+        records.append((*title_ref, *id_ref, first_tag, len(video.tags)))
+    id_index = sorted(
+        range(len(videos)),
+        key=lambda record: videos[record].video_id.encode("utf-8"))
+
+    with open(catalog_path, "wb") as catalog_file:
+        catalog_file.write(_HEADER.pack(_MAGIC, len(records), len(tag_refs)))
+        for record in records:
+            catalog_file.write(_VIDEO_RECORD.pack(*record))
+        for record in id_index:
+            catalog_file.write(_INDEX_ENTRY.pack(record))
+        for tag_ref in tag_refs:
+            catalog_file.write(_STRING_REF.pack(*tag_ref))
+        catalog_file.write(strings)
+
+
+class MappedVideoLibrary:
+    """A class used to represent a Video Library backed by a catalog file.
+
+    The catalog is memory-mapped read-only, so opening it does not depend
+    on its size and processes opening the same catalog share one copy of it
+    in the page cache. Videos are only decoded when they are requested.
+    """
+
+    def __init__(self, catalog_path):
+        """The MappedVideoLibrary class is initialized.
+
+        Args:
+            catalog_path: A catalog file written by compile_catalog.
+        """
+        with open(catalog_path, "rb") as catalog_file:
+            self._map = mmap.mmap(
+                catalog_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise CatalogError(f"{catalog_path} is not a video catalog")
+        magic, self._count, tag_ref_count = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC:
+            raise CatalogError(f"{catalog_path} is not a video catalog")
+        self._records_offset = _HEADER.size
+        self._index_offset = (
+            self._records_offset + self._count * _VIDEO_RECORD.size)
+        self._tags_offset = (
+            self._index_offset + self._count * _INDEX_ENTRY.size)
+        self._strings_offset = (
+            self._tags_offset + tag_ref_count * _STRING_REF.size)
+
+    def close(self):
+        """Unmaps the catalog file."""
+        self._map.close()
+
+    def _string(self, offset, length):
+        start = self._strings_offset + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def _record(self, record):
+        return _VIDEO_RECORD.unpack_from(
+            self._map, self._records_offset + record * _VIDEO_RECORD.size)
+
+    def _title(self, record):
+        title_offset, title_length, *_ = self._record(record)
+        return self._string(title_offset, title_length)
+
+    def _tags(self, record):
+        *_, first_tag, tag_count = self._record(record)
+        return [
+            self._string(*_STRING_REF.unpack_from(
+                self._map, self._tags_offset + tag * _STRING_REF.size))
+            for tag in range(first_tag, first_tag + tag_count)]
+
+    def _video(self, record):
+        title_offset, title_length, id_offset, id_length, _, _ = (
+            self._record(record))
+        return Video(
+            self._string(title_offset, title_length),
+            self._string(id_offset, id_length),
+            self._tags(record),
+        )
+
+    def get_row(self, video_id):
+        """Returns the record number of a video, None if it does not exist.
+
+        The id index is binary searched for the video.
+        """
+        target = video_id.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            record, = _INDEX_ENTRY.unpack_from(
+                self._map, self._index_offset + middle * _INDEX_ENTRY.size)
+            _, _, id_offset, id_length, _, _ = self._record(record)
+            start = self._strings_offset + id_offset
+            current = self._map[start:start + id_length]
+            if current == target:
+                return record
+            if current < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def get_video_count(self):
+        """Returns the number of videos in the library."""
+        return self._count
+
+    def get_rows(self):
+        """Returns the record numbers of all the videos."""
+        return range(self._count)
+
+    def get_video_by_row(self, row):
+        """Returns the video at a record number."""
+        return self._video(row)
+
+    def get_random_video(self):
+        """Returns a uniformly random video, None if the library is empty."""
+        if not self._count:
+            return None
+        return self._video(random.randrange(self._count))
+
+    def get_all_videos(self):
+        """Returns all available video information from the video library."""
+        return [self._video(record) for record in range(self._count)]
+
+    def iter_sorted_videos(self, after=None):
+        """Iterates over the videos in title order.
+
+        Args:
+            after: The id of the video to start after, instead of starting
+                from the first video. Nothing is returned if it does not
+                exist.
+        """
+        return map(self._video, self._sorted_records(after))
+
+    def iter_sorted_details(self, after=None):
+        """Iterates over the rendered videos in title order.
+
+        The videos are rendered as they are read instead of being kept, so
+        the memory used does not grow with the catalog.
+
+        Args:
+            after: The id of the video to start after, instead of starting
+                from the first video. Nothing is returned if it does not
+                exist.
+
+        Returns:
+            An iterator over the (record, details) pairs of the videos.
+        """
+        return ((record, self._video(record).details)
+                for record in self._sorted_records(after))
+
+    def _sorted_records(self, after):
+        if after is None:
+            return range(self._count)
+        record = self.get_row(after)
+        if record is None:
+            return range(0)
+        return range(record + 1, self._count)
+
+    def get_video(self, video_id):
+        """Returns the video object (title, url, tags) from the video library.
+
+        Args:
+            video_id: The video url.
+
+        Returns:
+            The Video object for the requested video_id. None if the video
+            does not exist.
+        """
+        record = self.get_row(video_id)
+        if record is None:
+            return None
+        return self._video(record)
+
+    def search_titles(self, search_term, excluded_rows=(), limit=None):
+        """Returns the videos whose titles contain the search term.
+
+        The catalog has no title index, so the titles are scanned in their
+        stored (title sorted) order, stopping at the limit.
+
+        Args:
+            search_term: The substring to look for in the video titles.
+            excluded_rows: The records of videos to leave out of the results.
+            limit: The most videos to return, all of them by default.
+        """
+        return [self._video(record) for record in itertools.islice(
+            self._title_matches(search_term, excluded_rows), limit)]
+
+    def count_titles(self, search_term, excluded_rows=()):
+        """Returns how many videos search_titles would return, without
+        building them."""
+        return sum(1 for _ in self._title_matches(search_term, excluded_rows))
+
+    def _title_matches(self, search_term, excluded_rows):
+        search_term = search_term.lower()
+        return (
+            record for record in range(self._count)
+            if record not in excluded_rows
+            and search_term in self._title(record).lower())
+
+    def search_tags(self, video_tag, excluded_rows=(), limit=None):
+        """Returns the videos with a tag containing the given tag.
+
+        Args:
+            video_tag: The (possibly partial) tag to look for, e.g. "#ca".
+            excluded_rows: The records of videos to leave out of the results.
+            limit: The most videos to return, all of them by default.
+        """
+        return [self._video(record) for record in itertools.islice(
+            self._tag_matches(video_tag, excluded_rows), limit)]
+
+    def count_tags(self, video_tag, excluded_rows=()):
+        """Returns how many videos search_tags would return, without
+        building them."""
+        return sum(1 for _ in self._tag_matches(video_tag, excluded_rows))
+
+    def _tag_matches(self, video_tag, excluded_rows):
+        video_tag = video_tag.lower()
+        if video_tag.startswith("#"):
+            matches = lambda tag: tag.startswith(video_tag)
+        else:
+            matches = lambda tag: video_tag in tag
+        return (
+            record for record in range(self._count)
+            if record not in excluded_rows
+            and any(matches(tag.lower()) for tag in self._tags(record)))
+
+
+if __name__ == "__main__":
+    argument_parser = argparse.ArgumentParser(
+        description="Compiles a video file into a memory-mapped catalog.")
+    argument_parser.add_argument(
+        "source", nargs="?", default=Path(__file__).parent / "videos.txt")
+    argument_parser.add_argument(
+        "catalog", nargs="?", default=Path(__file__).parent / "videos.cat")
+    arguments = argument_parser.parse_args()
+    compile_catalog(arguments.source, arguments.catalog)
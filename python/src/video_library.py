@@ -1,36 +1,351 @@
 """A video library class."""
 
-from .video import Video
+from .video_table import VideoTable
+from array import array
 from pathlib import Path
-import csv
+import bisect
+import heapq
+import itertools
+import random
 
+# Length of the lower-cased title n-grams kept in the search index.
+# Queries shorter than this fall back to a scan of the sorted titles.
+_NGRAM_SIZE = 3
 
-# Helper Wrapper around CSV reader to strip whitespace from around
-# each item.
-def _csv_reader_with_strip(reader):
-    yield from ((item.strip() for item in line) for line in reader)
+# Videos are handed to the library in batches of this many, parsed from
+# chunks of this many bytes of the video file.
+_BATCH_SIZE = 4096
+_CHUNK_SIZE = 1 << 20
+
+
+def _parse_video_line(line):
+    """Returns the title, id and tags of one "title | id | tags" line."""
+    title, url, tags = (item.strip() for item in line.split("|"))
+    return (
+        title,
+        url,
+        [tag.strip() for tag in tags.split(",")] if tags else [],
+    )
+
+
+def read_video_batches(path):
+    """Yields lists of videos parsed from a pipe-delimited video file.
+
+    Each video is a (title, video_id, tags) tuple.
+
+    The file is read in large byte chunks, so only the current chunk and
+    the current batch are held in memory while the file is parsed.
+    """
+    with open(path, "rb") as video_file:
+        batch = []
+        remainder = b""
+        while True:
+            chunk = video_file.read(_CHUNK_SIZE)
+            if not chunk:
+                lines = [remainder]
+            else:
+                lines = (remainder + chunk).split(b"\n")
+                remainder = lines.pop()
+            for line in lines:
+                line = line.decode("utf-8")
+                if line.strip():
+                    batch.append(_parse_video_line(line))
+                if len(batch) >= _BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if not chunk:
+                break
+        if batch:
+            yield batch
+
+
+class VideoLibraryError(Exception):
+    """A class used to represent a change to a frozen video library."""
+    pass
 
 
 class VideoLibrary:
     """A class used to represent a Video Library."""
 
-    def __init__(self):
-        """The VideoLibrary class is initialized."""
-        self._videos = {}
-        with open(Path(__file__).parent / "videos.txt") as video_file:
-            reader = _csv_reader_with_strip(
-                csv.reader(video_file, delimiter="|"))
-            for video_info in reader:
-                title, url, tags = video_info
-                self._videos[url] = Video(
-                    title,
-                    url,
-                    [tag.strip() for tag in tags.split(",")] if tags else [],
-                )
+    _shared = None
+
+    def __init__(self, path=None):
+        """The VideoLibrary class is initialized.
+
+        The video file is ingested lazily, when the library is first used.
+        Even a lookup by id loads the whole file, because a later line
+        with the same id replaces the video, and with it the row that
+        players key their flags by.
+
+        Args:
+            path: The pipe-delimited video file, videos.txt next to this
+                module by default.
+        """
+        self._videos = VideoTable()
+        if path is None:
+            path = Path(__file__).parent / "videos.txt"
+        self._pending_batches = read_video_batches(path)
+        self._frozen = False
+
+    @classmethod
+    def shared(cls):
+        """Returns the process-wide frozen library of the default videos.txt.
+
+        The library is created on the first call and every later call
+        returns the same object, so video players sharing it do not each
+        hold a copy of the catalog. Per-player state, such as playlists and
+        flags, is kept by the players themselves.
+        """
+        if cls._shared is None:
+            cls._shared = cls()
+            cls._shared.freeze()
+        return cls._shared
+
+    @property
+    def frozen(self):
+        return self._frozen
+
+    def freeze(self):
+        """Makes the library read-only.
+
+        Adding or removing videos afterwards raises VideoLibraryError.
+        """
+        self._frozen = True
+
+    def _load_next_batch(self):
+        """Adds the next batch of videos to the library.
+
+        Builds the search indexes once the last batch has been added.
+
+        Returns:
+            False if the library was already fully loaded, True otherwise.
+        """
+        if self._pending_batches is None:
+            return False
+        batch = next(self._pending_batches, None)
+        if batch is None:
+            self._pending_batches = None
+            self._build_title_order()
+            self._build_title_index()
+            self._build_tag_index()
+            return False
+        for title, video_id, tags in batch:
+            self._videos.append(title, video_id, tags)
+        return True
+
+    def _finish_loading(self):
+        """Loads the rest of the video file into the library."""
+        while self._load_next_batch():
+            pass
+
+    def _find_row(self, video_id):
+        """Returns the row of a video, once the video file is loaded."""
+        self._finish_loading()
+        return self._videos.row(video_id)
+
+    def _build_title_order(self):
+        """Builds the title sorted order of the rows.
+
+        Videos with the same title stay in the order they were added.
+        """
+        self._sorted_rows = array("I", sorted(
+            self._videos.rows(), key=self._videos.title))
+        # The rendered videos in the same order, built by the first listing.
+        self._sorted_details = None
+
+    def _build_title_index(self):
+        """Builds the n-gram index over the title sorted order.
+
+        The lower-cased titles are joined in title order into one string,
+        with a newline after each, and an array of offsets marks where each
+        title starts. Postings hold positions in the title sorted order
+        rather than rows, so a search result only needs its positions sorted
+        to come out in title order.
+        """
+        lower_titles = [self._videos.title(row).lower()
+                        for row in self._sorted_rows]
+        self._lower_text = "".join(title + "\n" for title in lower_titles)
+        self._lower_starts = array("Q", [0])
+        self._lower_starts.extend(itertools.accumulate(
+            len(title) + 1 for title in lower_titles))
+        self._title_index = {}
+        for position, title in enumerate(lower_titles):
+            for gram in _ngrams(title):
+                posting = self._title_index.get(gram)
+                if posting is None:
+                    posting = self._title_index[gram] = array("I")
+                posting.append(position)
+
+    def _build_tag_index(self):
+        """Builds the tag id to title sorted positions index.
+
+        The distinct tags are also kept sorted by their lower-cased name so
+        that a partial tag such as "#ca" resolves to a contiguous range of
+        tags with a binary search.
+        """
+        self._tag_index = {}
+        for position, row in enumerate(self._sorted_rows):
+            for tag_id in self._videos.tag_ids(row):
+                positions = self._tag_index.get(tag_id)
+                if positions is None:
+                    positions = self._tag_index[tag_id] = array("I")
+                # A video listing the same tag twice is only indexed once.
+                if not positions or positions[-1] != position:
+                    positions.append(position)
+        tag_dictionary = self._videos.tag_dictionary
+        sorted_tags = sorted(
+            (tag_dictionary.tag(tag_id).lower(), tag_id)
+            for tag_id in self._tag_index)
+        self._sorted_tag_names = [name for name, _ in sorted_tags]
+        self._sorted_tag_ids = [tag_id for _, tag_id in sorted_tags]
+
+    def add_video(self, title, video_id, tags):
+        """Adds a video to the library, replacing any video with its id.
+
+        The title sorted order is updated in place. The search indexes
+        refer to positions in that order, so they are rebuilt on the next
+        search instead.
+
+        Args:
+            title: The video title.
+            video_id: The video url.
+            tags: The video tags.
+
+        Raises:
+            VideoLibraryError: The library is frozen.
+        """
+        self.remove_video(video_id)
+        row = self._videos.append(title, video_id, tags)
+        position = bisect.bisect_right(
+            _SortedTitles(self._videos, self._sorted_rows), title)
+        self._sorted_rows.insert(position, row)
+        self._title_index = None
+        self._tag_index = None
+        self._sorted_details = None
+
+    def remove_video(self, video_id):
+        """Removes a video from the library.
+
+        Args:
+            video_id: The video url.
+
+        Returns:
+            True if the video was removed, False if it does not exist.
+
+        Raises:
+            VideoLibraryError: The library is frozen.
+        """
+        if self._frozen:
+            raise VideoLibraryError("Cannot change a frozen video library")
+        self._finish_loading()
+        row = self._videos.row(video_id)
+        if row is None:
+            return False
+        position = self._title_position(row)
+        del self._sorted_rows[position]
+        self._videos.remove(video_id)
+        self._title_index = None
+        self._tag_index = None
+        self._sorted_details = None
+        return True
+
+    def _title_position(self, row):
+        """Returns the position of a row in the title sorted order."""
+        position = bisect.bisect_left(
+            _SortedTitles(self._videos, self._sorted_rows),
+            self._videos.title(row))
+        while self._sorted_rows[position] != row:
+            position += 1
+        return position
+
+    def get_video_count(self):
+        """Returns the number of videos in the library."""
+        self._finish_loading()
+        return len(self._videos)
+
+    def get_row(self, video_id):
+        """Returns the row number of a video, None if it does not exist.
+
+        Rows are small integers that stay the same for as long as the video
+        is in the library, so they can index bitmaps of videos.
+        """
+        return self._find_row(video_id)
+
+    def get_rows(self):
+        """Returns the row numbers of all the videos."""
+        self._finish_loading()
+        return self._videos.rows()
+
+    def get_video_by_row(self, row):
+        """Returns the video at a row returned by get_row or get_rows."""
+        return self._videos.video(row)
+
+    def get_random_video(self):
+        """Returns a uniformly random video, None if the library is empty."""
+        self._finish_loading()
+        if not self._sorted_rows:
+            return None
+        return self._videos.video(
+            self._sorted_rows[random.randrange(len(self._sorted_rows))])
 
     def get_all_videos(self):
         """Returns all available video information from the video library."""
-        return list(self._videos.values())
+        self._finish_loading()
+        return [self._videos.video(row) for row in self._videos.rows()]
+
+    def iter_sorted_videos(self, after=None):
+        """Iterates over the videos in title order.
+
+        The videos are read from the maintained title order as the iterator
+        advances, without sorting or copying the library. Starting after a
+        video binary searches the order for its title.
+
+        Args:
+            after: The id of the video to start after, instead of starting
+                from the first video. Nothing is returned if it does not
+                exist.
+        """
+        self._finish_loading()
+        position = 0
+        if after is not None:
+            row = self._videos.row(after)
+            if row is None:
+                return
+            position = self._title_position(row) + 1
+        sorted_rows = self._sorted_rows
+        for position in range(position, len(sorted_rows)):
+            yield self._videos.video(sorted_rows[position])
+
+    def iter_sorted_details(self, after=None):
+        """Iterates over the rendered videos in title order.
+
+        Every video is rendered as "title (video_id) [tags]" once, by the
+        first listing, and kept in title order alongside the rows, so later
+        listings only join the kept strings. Changing the library drops
+        them until the next listing.
+
+        Args:
+            after: The id of the video to start after, instead of starting
+                from the first video. Nothing is returned if it does not
+                exist.
+
+        Returns:
+            An iterator over the (row, details) pairs of the videos.
+        """
+        self._finish_loading()
+        if self._sorted_details is None:
+            self._sorted_details = list(
+                map(self._videos.details, self._sorted_rows))
+        if after is None:
+            return zip(self._sorted_rows, self._sorted_details)
+        row = self._videos.row(after)
+        if row is None:
+            return iter(())
+        sorted_rows = self._sorted_rows
+        sorted_details = self._sorted_details
+        return ((sorted_rows[position], sorted_details[position])
+                for position in range(
+                    self._title_position(row) + 1, len(sorted_rows)))
 
     def get_video(self, video_id):
         """Returns the video object (title, url, tags) from the video library.
@@ -42,4 +357,196 @@ class VideoLibrary:
             The Video object for the requested video_id. None if the video
             does not exist.
         """
-        return self._videos.get(video_id, None)
+        row = self._find_row(video_id)
+        if row is None:
+            return None
+        return self._videos.video(row)
+
+    def search_titles(self, search_term, excluded_rows=(), limit=None):
+        """Returns the videos whose titles contain the search term.
+
+        The match is case insensitive and the videos are returned sorted by
+        title.
+
+        Args:
+            search_term: The substring to look for in the video titles.
+            excluded_rows: The rows of videos to leave out of the results.
+            limit: The most videos to return. The search stops once it has
+                found this many, all of them by default.
+        """
+        rows = self._rows_at(
+            self._title_positions(search_term.lower()), excluded_rows)
+        return [self._videos.video(row)
+                for row in itertools.islice(rows, limit)]
+
+    def count_titles(self, search_term, excluded_rows=()):
+        """Returns how many videos search_titles would return, without
+        building them."""
+        return sum(1 for _ in self._rows_at(
+            self._title_positions(search_term.lower()), excluded_rows))
+
+    def _title_positions(self, search_term):
+        """Returns an iterator over the title sorted positions of the titles
+        containing a lower-cased search term, in order."""
+        self._finish_loading()
+        if self._title_index is None:
+            self._build_title_index()
+        if len(search_term) < _NGRAM_SIZE:
+            return self._scan_title_positions(search_term)
+        postings = []
+        for gram in _ngrams(search_term):
+            posting = self._title_index.get(gram)
+            if posting is None:
+                return iter(())
+            postings.append(posting)
+        # Every matching title has all the n-grams, so walking the shortest
+        # posting finds them all, already in title order.
+        candidates = min(postings, key=len)
+        # Sharing every n-gram does not guarantee the n-grams are
+        # contiguous, so each candidate is still checked.
+        lower_text = self._lower_text
+        starts = self._lower_starts
+        return (position for position in candidates
+                if lower_text.find(search_term, starts[position],
+                                   starts[position + 1] - 1) >= 0)
+
+    def _scan_title_positions(self, search_term):
+        """Yields the title sorted positions of the titles containing a
+        lower-cased search term by searching the joined titles."""
+        lower_text = self._lower_text
+        starts = self._lower_starts
+        if not search_term:
+            yield from range(len(starts) - 1)
+            return
+        offset = lower_text.find(search_term)
+        while offset >= 0:
+            position = bisect.bisect_right(starts, offset) - 1
+            # A match running into the next title is not in this one.
+            if offset + len(search_term) < starts[position + 1]:
+                yield position
+            offset = lower_text.find(search_term, starts[position + 1])
+
+    def _rows_at(self, positions, excluded_rows):
+        """Returns an iterator over the rows at title sorted positions,
+        except for the excluded rows."""
+        rows = map(self._sorted_rows.__getitem__, positions)
+        if excluded_rows:
+            return (row for row in rows if row not in excluded_rows)
+        return rows
+
+    def get_tag_id(self, tag):
+        """Returns the id of a tag, None if no video has that exact tag."""
+        self._finish_loading()
+        return self._videos.tag_dictionary.tag_id(tag)
+
+    def get_tag(self, tag_id):
+        """Returns the tag with the given id."""
+        return self._videos.tag_dictionary.tag(tag_id)
+
+    def get_tag_ids(self, video_id):
+        """Returns the ids of a video's tags, None if the video does not
+        exist."""
+        row = self._find_row(video_id)
+        if row is None:
+            return None
+        return self._videos.tag_ids(row)
+
+    def find_tag_ids(self, video_tag):
+        """Returns the ids of the tags containing the given tag.
+
+        The match is case insensitive.
+
+        Args:
+            video_tag: The (possibly partial) tag to look for, e.g. "#ca".
+        """
+        self._finish_loading()
+        if self._tag_index is None:
+            self._build_tag_index()
+        video_tag = video_tag.lower()
+        if not video_tag.startswith("#"):
+            return [
+                tag_id for name, tag_id
+                in zip(self._sorted_tag_names, self._sorted_tag_ids)
+                if video_tag in name]
+        tag_ids = []
+        position = bisect.bisect_left(self._sorted_tag_names, video_tag)
+        while (position < len(self._sorted_tag_names)
+               and self._sorted_tag_names[position].startswith(video_tag)):
+            tag_ids.append(self._sorted_tag_ids[position])
+            position += 1
+        return tag_ids
+
+    def get_videos_with_tag_ids(self, tag_ids, excluded_rows=(), limit=None):
+        """Returns the videos having any of the given tags.
+
+        Each video is returned once and the videos are returned sorted by
+        title.
+
+        Args:
+            tag_ids: The ids of the tags to look for.
+            excluded_rows: The rows of videos to leave out of the results.
+            limit: The most videos to return. The search stops once it has
+                found this many, all of them by default.
+        """
+        rows = self._rows_at(self._tag_positions(tag_ids), excluded_rows)
+        return [self._videos.video(row)
+                for row in itertools.islice(rows, limit)]
+
+    def _tag_positions(self, tag_ids):
+        """Returns an iterator over the title sorted positions of the videos
+        having any of the given tags, in order and without repeats.
+
+        The positions of each tag are already sorted, so they are merged
+        lazily instead of collected and sorted.
+        """
+        self._finish_loading()
+        if self._tag_index is None:
+            self._build_tag_index()
+        postings = [self._tag_index.get(tag_id, []) for tag_id in tag_ids]
+        if len(postings) == 1:
+            return iter(postings[0])
+        return (position for position, _ in itertools.groupby(
+            heapq.merge(*postings)))
+
+    def search_tags(self, video_tag, excluded_rows=(), limit=None):
+        """Returns the videos with a tag containing the given tag.
+
+        The match is case insensitive, each video is returned once and the
+        videos are returned sorted by title.
+
+        Args:
+            video_tag: The (possibly partial) tag to look for, e.g. "#ca".
+            excluded_rows: The rows of videos to leave out of the results.
+            limit: The most videos to return. The search stops once it has
+                found this many, all of them by default.
+        """
+        return self.get_videos_with_tag_ids(
+            self.find_tag_ids(video_tag), excluded_rows, limit)
+
+    def count_tags(self, video_tag, excluded_rows=()):
+        """Returns how many videos search_tags would return, without
+        building them."""
+        return sum(1 for _ in self._rows_at(
+            self._tag_positions(self.find_tag_ids(video_tag)),
+            excluded_rows))
+
+
+class _SortedTitles:
+    """The titles of a table's rows in title order, read on access, for
+    bisecting."""
+
+    def __init__(self, videos, sorted_rows):
+        self._videos = videos
+        self._sorted_rows = sorted_rows
+
+    def __len__(self):
+        return len(self._sorted_rows)
+
+    def __getitem__(self, position):
+        return self._videos.title(self._sorted_rows[position])
+
+
+def _ngrams(text):
+    """Returns the set of distinct n-grams of a lower-cased string."""
+    return {text[i:i + _NGRAM_SIZE]
+            for i in range(len(text) - _NGRAM_SIZE + 1)}
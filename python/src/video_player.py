@@ -1,40 +1,157 @@
 """A video player class."""
 
+import itertools
+import operator
+
 from .video_library import VideoLibrary
 from .video_state import VideoState
-from .video_playlist import Playlist
-import random
+from .playlist_registry import PlaylistRegistry
+from .output_sink import StreamSink
+from .flag_store import FlagStore
+from .playable_set import PlayableSet
+from .playlist_journal import ADD, CLEAR, CREATE, DELETE, REMOVE
 
 
 class VideoPlayer:
     """A class used to represent a Video Player."""
 
-    def __init__(self):
-        self._video_library = VideoLibrary()
+    def __init__(self, video_library=None, output=None, read_answer=None,
+                 playlist_journal=None, ask_to_play=True, id_files=True):
+        """The VideoPlayer class is initialized.
+
+        Args:
+            video_library: The LibraryBackend to play videos from, such as
+                one returned by open_library, the shared library of
+                videos.txt by default. The player never changes the
+                library.
+            output: The sink all the player output is written to, stdout by
+                default.
+            read_answer: Called without arguments to read the answer to a
+                question asked by the player, input() by default.
+            playlist_journal: A PlaylistJournal to load the playlists from
+                and record their changes in. Playlists only last as long as
+                the player without one.
+            ask_to_play: Whether searches ask which result to play and wait
+                for the answer. Without asking, a result of the last search
+                is played with play_result instead, so searching never
+                blocks.
+            id_files: Whether the bulk playlist commands read video_ids
+                from an "@path" file argument. Without id files, such an
+                argument is taken as a video_id, so remote clients cannot
+                make the player open local files.
+        """
+        if video_library is None:
+            video_library = VideoLibrary.shared()
+        if output is None:
+            output = StreamSink()
+        self._video_library = video_library
+        self._output = output
+        # The default looks input up when called, so that patching
+        # builtins.input after creating the player still takes effect.
+        self._read_answer = (
+            (lambda: input()) if read_answer is None else read_answer)
+        self._ask_to_play = ask_to_play
+        self._id_files = id_files
+        # The results of the last search, which play_result selects from.
+        self._last_results = []
         self._video_state = VideoState("STOPPED", "")
-        self._playlist_library = []
+        self._playlists = PlaylistRegistry()
+        self._playlist_journal = playlist_journal
+        if playlist_journal is not None:
+            playlist_journal.replay(self._playlists, video_library)
+        self._flags = FlagStore()
+        # The rows of the videos that are not flagged, only kept while more
+        # than half of the library is flagged.
+        self._playable = None
+
+    @property
+    def output(self):
+        return self._output
+
+    def _print(self, line):
+        self._output.write(line + "\n")
+
+    def _record(self, record_type, playlist_name, video_id=None):
+        if self._playlist_journal is not None:
+            self._playlist_journal.record(record_type, playlist_name, video_id)
+
+    def _record_many(self, record_type, playlist_name, video_ids):
+        if self._playlist_journal is not None and video_ids:
+            self._playlist_journal.record_many(
+                record_type, playlist_name, video_ids)
 
     def number_of_videos(self):
-        num_videos = len(self._video_library.get_all_videos())
-        print(f"{num_videos} videos in the library")
+        num_videos = self._video_library.get_video_count()
+        self._print(f"{num_videos} videos in the library")
+
+    def show_all_videos(self, page_size=None, cursor=None):
+        """Returns all videos, or one page of them.
+
+        Args:
+            page_size: The most videos to show, all of them by default.
+            cursor: The continuation token printed after the previous page,
+                to show the page following it instead of the first one.
+        """
+        if page_size is not None:
+            page_size = _parse_limit(page_size)
+            if page_size is None:
+                self._print("Cannot show videos: Invalid page size")
+                return
+        if cursor is not None and self._video_library.get_row(cursor) is None:
+            self._print("Cannot show videos: Invalid cursor")
+            return
 
-    def show_all_videos(self):
-        """Returns all videos."""
+        self._print("Here's a list of all available videos:")
+        if page_size is None:
+            self._print_sorted_details(
+                self._video_library.iter_sorted_details(cursor))
+            return
+        next_cursor = self._print_page(
+            self._video_library.iter_sorted_videos(cursor), page_size)
+        if next_cursor is not None:
+            self._print(f"Next page: SHOW_ALL_VIDEOS {page_size} {next_cursor}")
 
-        all_videos = sorted(self._video_library.get_all_videos(), key=lambda video: video.title)
+    def _print_page(self, videos, page_size):
+        """Prints the details of the first page_size videos.
 
-        print("Here's a list of all available videos:")
-        self.print_video_details(all_videos)
+        Returns:
+            The continuation token of the next page, the id of the last
+            video printed, or None if there are no videos left.
+        """
+        page = list(itertools.islice(videos, page_size + 1))
+        has_next = len(page) > page_size
+        del page[page_size:]
+        self.print_video_details(page)
+        return page[-1].video_id if has_next else None
 
     def print_video_details(self, all_videos):
-        for video in all_videos:
-            tags = video.tags
-            formatted_tags = ""
+        if not self._flags:
+            details = [video.details for video in all_videos]
+        else:
+            suffix = self._flags.suffix
+            details = [video.details + suffix(video.video_id)
+                       for video in all_videos]
+        self._write_details(details)
+
+    def _print_sorted_details(self, sorted_details):
+        """Prints the (row, details) pairs of iter_sorted_details.
 
-            for tag in tags:
-                formatted_tags += tag + " "
+        Without flags the library's rendered strings are joined as they
+        are.
+        """
+        if not self._flags:
+            details = map(operator.itemgetter(1), sorted_details)
+        else:
+            row_suffix = self._flags.row_suffix
+            details = (details + row_suffix(row)
+                       for row, details in sorted_details)
+        self._write_details(details)
 
-            print(f"  {video.title} ({video.video_id}) [{formatted_tags.rstrip()}]")
+    def _write_details(self, details):
+        """Writes rendered videos as an indented listing."""
+        listing = "\n  ".join(details)
+        if listing:
+            self._output.write(f"  {listing}\n")
 
     def play_video(self, video_id):
         """Plays the respective video.
@@ -46,16 +163,19 @@ class VideoPlayer:
         video = self._video_library.get_video(video_id)
 
         if video is None:
-            print("Cannot play video: Video does not exist")
+            self._print("Cannot play video: Video does not exist")
+        elif video_id in self._flags:
+            self._print(f"Cannot play video: Video is currently flagged "
+                        f"(reason: {self._flags.reason(video_id)})")
         elif self._video_state.state == "STOPPED":
-            print(f"Playing video: {video.title}")
+            self._print(f"Playing video: {video.title}")
             self._video_state.state = "PLAYING"
             self._video_state.video_id = video_id
         else:
             prev_video_id = self._video_state.video_id
             prev_video = self._video_library.get_video(prev_video_id)
-            print(f"Stopping video: {prev_video.title}")
-            print(f"Playing video: {video.title}")
+            self._print(f"Stopping video: {prev_video.title}")
+            self._print(f"Playing video: {video.title}")
             self._video_state.state = "PLAYING"
             self._video_state.video_id = video_id
 
@@ -65,31 +185,60 @@ class VideoPlayer:
         if self._video_state.state == "PLAYING" or self._video_state.state == "PAUSED":
             video_id = self._video_state.video_id
             video = self._video_library.get_video(video_id)
-            print(f"Stopping video: {video.title}")
+            self._print(f"Stopping video: {video.title}")
             self._video_state.state = "STOPPED"
         elif self._video_state.state == "STOPPED":
-            print("Cannot stop video: No video is currently playing")
+            self._print("Cannot stop video: No video is currently playing")
 
     def play_random_video(self):
         """Plays a random video from the video library."""
 
-        random_vid = random.choice(self._video_library.get_all_videos())
+        random_vid = self._random_playable_video()
+        if random_vid is None:
+            self._print("No videos available")
+            return
+
         self.play_video(random_vid.video_id)
 
+    def _random_playable_video(self):
+        """Returns a uniformly random video that is not flagged, None if
+        there is none.
+
+        While at most half of the library is flagged, random videos are
+        drawn until one is not flagged, which takes two draws at most on
+        average and keeps nothing per player. Past that, the rows of the
+        unflagged videos are packed into a PlayableSet, which is then
+        smaller than the flags the player already holds.
+        """
+        if self._playable is None:
+            if 2 * len(self._flags) <= self._video_library.get_video_count():
+                while True:
+                    video = self._video_library.get_random_video()
+                    if video is None or video.video_id not in self._flags:
+                        return video
+            flagged_rows = self._flags.flagged_rows
+            self._playable = PlayableSet(
+                row for row in self._video_library.get_rows()
+                if row not in flagged_rows)
+        row = self._playable.choice()
+        if row is None:
+            return None
+        return self._video_library.get_video_by_row(row)
+
     def pause_video(self):
         """Pauses the current video."""
 
         if self._video_state.state == "PLAYING":
             video_id = self._video_state.video_id
             video = self._video_library.get_video(video_id)
-            print(f"Pausing video: {video.title}")
+            self._print(f"Pausing video: {video.title}")
             self._video_state.state = "PAUSED"
         elif self._video_state.state == "PAUSED":
             video_id = self._video_state.video_id
             video = self._video_library.get_video(video_id)
-            print(f"Video already paused: {video.title}")
+            self._print(f"Video already paused: {video.title}")
         elif self._video_state.state == "STOPPED":
-            print("Cannot pause video: No video is currently playing")
+            self._print("Cannot pause video: No video is currently playing")
 
     def continue_video(self):
         """Resumes playing the current video."""
@@ -97,31 +246,26 @@ class VideoPlayer:
         if self._video_state.state == "PAUSED":
             video_id = self._video_state.video_id
             video = self._video_library.get_video(video_id)
-            print(f"Continuing video: {video.title}")
+            self._print(f"Continuing video: {video.title}")
             self._video_state.state = "PLAYING"
         elif self._video_state.state == "PLAYING":
-            print("Cannot continue video: Video is not paused")
+            self._print("Cannot continue video: Video is not paused")
         elif self._video_state.state == "STOPPED":
-            print("Cannot continue video: No video is currently playing")
+            self._print("Cannot continue video: No video is currently playing")
 
     def show_playing(self):
         """Displays video currently playing."""
         if self._video_state.state == "STOPPED":
-            print("No video is currently playing")
+            self._print("No video is currently playing")
             return
 
         video_id = self._video_state.video_id
         video = self._video_library.get_video(video_id)
-        tags = video.tags
-        formatted_tags = ""
-
-        for tag in tags:
-            formatted_tags += tag + " "
 
         if self._video_state.state == "PLAYING":
-            print(f"Currently playing: {video.title} ({video.video_id}) [{formatted_tags.rstrip()}]")
+            self._print(f"Currently playing: {video.details}")
         elif self._video_state.state == "PAUSED":
-            print(f"Currently playing: {video.title} ({video.video_id}) [{formatted_tags.rstrip()}] - PAUSED")
+            self._print(f"Currently playing: {video.details} - PAUSED")
 
     def create_playlist(self, playlist_name):
         """Creates a playlist with a given name.
@@ -130,21 +274,14 @@ class VideoPlayer:
             playlist_name: The playlist name.
         """
 
-        duplicate_playlist = self.check_playlist_exists(playlist_name)
-
-        if duplicate_playlist:
-            print("Cannot create playlist: A playlist with the same name already exists")
+        if self._playlists.create(playlist_name) is None:
+            self._print("Cannot create playlist: A playlist with the same name already exists")
         else:
-            self._playlist_library.append(Playlist(playlist_name))
-            print(f"Successfully created new playlist: {playlist_name}")
+            self._record(CREATE, playlist_name)
+            self._print(f"Successfully created new playlist: {playlist_name}")
 
     def check_playlist_exists(self, playlist_name):
-        duplicate_name = False
-        for playlist in self._playlist_library:
-            if playlist.name.lower() == playlist_name.lower():
-                duplicate_name = True
-        return duplicate_name
-
+        return playlist_name in self._playlists
 
     def add_to_playlist(self, playlist_name, video_id):
         """Adds a video to a playlist with a given name.
@@ -154,68 +291,170 @@ class VideoPlayer:
             video_id: The video_id to be added.
         """
 
-        valid_playlist = self.check_playlist_exists(playlist_name)
-        if not valid_playlist:
-            print(f"Cannot add video to {playlist_name}: Playlist does not exist")
+        playlist = self._playlists.get(playlist_name)
+        if playlist is None:
+            self._print(f"Cannot add video to {playlist_name}: Playlist does not exist")
             return
 
         video = self._video_library.get_video(video_id)
         if video is None:
-            print(f"Cannot add video to {playlist_name}: Video does not exist")
+            self._print(f"Cannot add video to {playlist_name}: Video does not exist")
+            return
+
+        if video_id in self._flags:
+            self._print(f"Cannot add video to {playlist_name}: Video is currently "
+                        f"flagged (reason: {self._flags.reason(video_id)})")
+            return
+
+        if not playlist.add_video(video):
+            self._print(f"Cannot add video to {playlist_name}: Video already added")
             return
 
-        duplicate_video = self.duplicate_playlist_video(playlist_name, video_id)
-        if duplicate_video:
-            print(f"Cannot add video to {playlist_name}: Video already added")
+        self._record(ADD, playlist.name, video_id)
+        self._print(f"Added video to {playlist_name}: {video.title}")
+
+    def add_many_to_playlist(self, playlist_name, *video_ids):
+        """Adds videos to a playlist with a given name in one pass.
+
+        Prints one summary instead of a line per video.
+
+        Args:
+            playlist_name: The playlist name.
+            video_ids: The video_ids to be added, or a single "@path" of a
+                file of whitespace separated video_ids.
+        """
+        playlist = self._playlists.get(playlist_name)
+        if playlist is None:
+            self._print(f"Cannot add videos to {playlist_name}: Playlist does not exist")
+            return
+
+        try:
+            video_ids = self._expand_video_ids(video_ids)
+        except (OSError, UnicodeDecodeError):
+            self._print(f"Cannot add videos to {playlist_name}: Cannot read {video_ids[0][1:]}")
             return
 
-        video_name = self._video_library.get_video(video_id).title
-        print(f"Added video to {playlist_name}: {video_name}")
+        added_ids = []
+        already_added = missing = flagged = 0
+        for video_id in video_ids:
+            video = self._video_library.get_video(video_id)
+            if video is None:
+                missing += 1
+            elif video_id in self._flags:
+                flagged += 1
+            elif playlist.add_video(video):
+                added_ids.append(video_id)
+            else:
+                already_added += 1
+        self._record_many(ADD, playlist.name, added_ids)
+
+        skipped = _skipped_summary(
+            (already_added, "already added"), (missing, "do not exist"),
+            (flagged, "flagged"))
+        self._print(
+            f"Added {len(added_ids)} videos to {playlist_name}{skipped}")
+
+    def remove_many_from_playlist(self, playlist_name, *video_ids):
+        """Removes videos from a playlist with a given name in one pass.
+
+        Prints one summary instead of a line per video.
 
-    def duplicate_playlist_video(self, playlist_name, video_id):
-        for playlist in self._playlist_library:
-            if playlist.name.lower() == playlist_name.lower():
-                videos = playlist.videos
+        Args:
+            playlist_name: The playlist name.
+            video_ids: The video_ids to be removed, or a single "@path" of a
+                file of whitespace separated video_ids.
+        """
+        playlist = self._playlists.get(playlist_name)
+        if playlist is None:
+            self._print(f"Cannot remove videos from {playlist_name}: Playlist does not exist")
+            return
 
-                for video in videos:
-                    if video.video_id == video_id:
-                        return True
+        try:
+            video_ids = self._expand_video_ids(video_ids)
+        except (OSError, UnicodeDecodeError):
+            self._print(f"Cannot remove videos from {playlist_name}: Cannot read {video_ids[0][1:]}")
+            return
 
-                playlist.videos = self._video_library.get_video(video_id)
-                return False
+        removed_ids = []
+        not_in_playlist = missing = 0
+        for video_id in video_ids:
+            if playlist.delete_video(video_id):
+                removed_ids.append(video_id)
+            elif self._video_library.get_video(video_id) is None:
+                missing += 1
+            else:
+                not_in_playlist += 1
+        self._record_many(REMOVE, playlist.name, removed_ids)
+
+        skipped = _skipped_summary(
+            (not_in_playlist, "not in playlist"), (missing, "do not exist"))
+        self._print(
+            f"Removed {len(removed_ids)} videos from {playlist_name}{skipped}")
+
+    def _expand_video_ids(self, video_ids):
+        """Returns the distinct video ids of a bulk command in order.
+
+        With id files enabled, a single "@path" argument is replaced by the
+        ids listed in that file. Repeated ids are only returned once.
+
+        Raises:
+            OSError: The id file cannot be read.
+            UnicodeDecodeError: The id file is not text.
+        """
+        if (self._id_files and len(video_ids) == 1
+                and video_ids[0].startswith("@")):
+            with open(video_ids[0][1:]) as id_file:
+                video_ids = id_file.read().split()
+        return dict.fromkeys(video_ids)
 
     def show_all_playlists(self):
         """Display all playlists."""
 
-        if not self._playlist_library:
-            print("No playlists exist yet")
+        if not self._playlists:
+            self._print("No playlists exist yet")
             return
 
-        all_playlists = sorted(self._playlist_library, key=lambda playlist: playlist.name)
-
-        print("Showing all playlists:")
-        for playlist in all_playlists:
-            print(f"  {playlist.name}")
+        self._output.write("".join([
+            "Showing all playlists:\n",
+            *(f"  {playlist.name}\n"
+              for playlist in self._playlists.sorted_playlists()),
+        ]))
 
-    def show_playlist(self, playlist_name):
-        """Display all videos in a playlist with a given name.
+    def show_playlist(self, playlist_name, page_size=None, cursor=None):
+        """Display all videos in a playlist with a given name, or one page of
+        them.
 
         Args:
             playlist_name: The playlist name.
+            page_size: The most videos to show, all of them by default.
+            cursor: The continuation token printed after the previous page,
+                to show the page following it instead of the first one.
         """
-        for playlist in self._playlist_library:
-            if playlist.name.lower() == playlist_name.lower():
-                print(f"Showing playlist: {playlist_name}")
-                videos = playlist.videos
+        playlist = self._playlists.get(playlist_name)
+        if playlist is None:
+            self._print(f"Cannot show playlist {playlist_name}: Playlist does not exist")
+            return
+        if page_size is not None:
+            page_size = _parse_limit(page_size)
+            if page_size is None:
+                self._print(f"Cannot show playlist {playlist_name}: Invalid page size")
+                return
+        if cursor is not None and cursor not in playlist:
+            self._print(f"Cannot show playlist {playlist_name}: Invalid cursor")
+            return
 
-                if not videos:
-                    print("  No videos here yet")
-                    return
-                else:
-                    self.print_video_details(videos)
-                    return
+        self._print(f"Showing playlist: {playlist_name}")
 
-        print(f"Cannot show playlist {playlist_name}: Playlist does not exist")
+        if not playlist:
+            self._print("  No videos here yet")
+        elif page_size is None:
+            self.print_video_details(playlist.videos)
+        else:
+            next_cursor = self._print_page(
+                playlist.iter_videos(cursor), page_size)
+            if next_cursor is not None:
+                self._print(f"Next page: SHOW_PLAYLIST {playlist_name} "
+                            f"{page_size} {next_cursor}")
 
     def remove_from_playlist(self, playlist_name, video_id):
         """Removes a video to a playlist with a given name.
@@ -224,29 +463,22 @@ class VideoPlayer:
             playlist_name: The playlist name.
             video_id: The video_id to be removed.
         """
-        playlist_exists = False
-
         video = self._video_library.get_video(video_id)
-
         if not video:
-            print(f"Cannot remove video from {playlist_name}: Video does not exist")
+            self._print(f"Cannot remove video from {playlist_name}: Video does not exist")
             return
 
-        for playlist in self._playlist_library:
-            if playlist.name.lower() == playlist_name.lower():
-                playlist_exists = True
-                videos = playlist.videos
+        playlist = self._playlists.get(playlist_name)
+        if playlist is None:
+            self._print(f"Cannot remove video from {playlist_name}: Playlist does not exist")
+            return
 
-                for video in videos:
-                    if video.video_id == video_id:
-                        playlist.delete_video(video_id)
-                        print(f"Removed video from {playlist_name}: {video.title}")
-                        return
+        if not playlist.delete_video(video_id):
+            self._print(f"Cannot remove video from {playlist_name}: Video is not in playlist")
+            return
 
-        if not playlist_exists:
-            print(f"Cannot remove video from {playlist_name}: Playlist does not exist")
-        else:
-            print(f"Cannot remove video from {playlist_name}: Video is not in playlist")
+        self._record(REMOVE, playlist.name, video_id)
+        self._print(f"Removed video from {playlist_name}: {video.title}")
 
     def clear_playlist(self, playlist_name):
         """Removes all videos from a playlist with a given name.
@@ -254,16 +486,14 @@ class VideoPlayer:
         Args:
             playlist_name: The playlist name.
         """
-        playlist_exists = False
-
-        for playlist in self._playlist_library:
-            if playlist.name.lower() == playlist_name.lower():
-                playlist_exists = True
-                playlist.clear()
-                print(f"Successfully removed all videos from {playlist_name}")
+        playlist = self._playlists.get(playlist_name)
+        if playlist is None:
+            self._print(f"Cannot clear playlist {playlist_name}: Playlist does not exist")
+            return
 
-        if not playlist_exists:
-            print(f"Cannot clear playlist {playlist_name}: Playlist does not exist")
+        playlist.clear()
+        self._record(CLEAR, playlist.name)
+        self._print(f"Successfully removed all videos from {playlist_name}")
 
     def delete_playlist(self, playlist_name):
         """Deletes a playlist with a given name.
@@ -272,94 +502,105 @@ class VideoPlayer:
             playlist_name: The playlist name.
         """
 
-        for playlist in self._playlist_library:
-            if playlist.name.lower() == playlist_name.lower():
-                self._playlist_library.remove(playlist)
-                print(f"Deleted playlist: {playlist_name}")
-                return
-
-        print(f"Cannot delete playlist {playlist_name}: Playlist does not exist")
-
+        playlist = self._playlists.delete(playlist_name)
+        if playlist is None:
+            self._print(f"Cannot delete playlist {playlist_name}: Playlist does not exist")
+        else:
+            self._record(DELETE, playlist.name)
+            self._print(f"Deleted playlist: {playlist_name}")
 
-    def search_videos(self, search_term):
+    def search_videos(self, search_term, option=None):
         """Display all the videos whose titles contain the search_term.
 
         Args:
             search_term: The query to be used in search.
-        """
-        videos = sorted(self._video_library.get_all_videos(), key=lambda video: video.title)
-
-        video_results = []
-
-        for video in videos:
-            if search_term.lower() in video.title.lower():
-                video_results.append(video)
-
-        if not video_results:
-            print(f"No search results for {search_term}")
-            return
-
-        self.print_video_details_search(video_results, search_term)
-
-        command = input()
-
-        try:
-            index = int(command) - 1
+            option: A number to only show that many of the first results,
+                or COUNT to only show how many results there are.
 
-            if index in range(len(video_results)):
-                selected_video = video_results[index]
-                self.play_video(selected_video.video_id)
-        except ValueError:
-            return
+        Returns:
+            The videos shown, which play_result selects from. None for
+            COUNT.
+        """
+        return self._search(
+            search_term, option, self._video_library.search_titles,
+            self._video_library.count_titles)
 
     def print_video_details_search(self, all_videos, query):
-        print(f"Here are the results for {query}:")
-        index = 1
-        for video in all_videos:
-            tags = video.tags
-            formatted_tags = ""
-
-            for tag in tags:
-                formatted_tags += tag + " "
-
-            print(f"{index}) {video.title} ({video.video_id}) [{formatted_tags.rstrip()}]")
-            index += 1
-        print("Would you like to play any of the above? If yes, specify the number of the video.")
-        print("If your answer is not a valid number, we will assume it's a no.")
-
-
-
-
+        self._output.write("".join([
+            f"Here are the results for {query}:\n",
+            *(f"{index}) {video.details}\n"
+              for index, video in enumerate(all_videos, 1)),
+        ]))
 
-
-    def search_videos_tag(self, video_tag):
+    def search_videos_tag(self, video_tag, option=None):
         """Display all videos whose tags contains the provided tag.
 
         Args:
             video_tag: The video tag to be used in search.
+            option: A number to only show that many of the first results,
+                or COUNT to only show how many results there are.
+
+        Returns:
+            The videos shown, which play_result selects from. None for
+            COUNT.
         """
 
         if "#" not in video_tag:
-            print(f"No search results for {video_tag}")
-            return
-
-        videos = sorted(self._video_library.get_all_videos(), key=lambda video: video.title)
+            self._print(f"No search results for {video_tag}")
+            self._last_results = []
+            return self._last_results
 
-        video_results = []
+        return self._search(
+            video_tag, option, self._video_library.search_tags,
+            self._video_library.count_tags)
 
-        for video in videos:
-            for tag in video.tags:
-                if video_tag.lower() in tag.lower():
-                    video_results.append(video)
+    def _search(self, query, option, search, count):
+        """Runs a search and offers to play one of its results.
 
-
-        if not video_results:
-            print(f"No search results for {video_tag}")
+        Args:
+            query: The search term or video tag.
+            option: The optional limit or COUNT argument of the command.
+            search: The library method returning the results.
+            count: The library method returning the number of results.
+        """
+        # PLAY_RESULT must not play the results of an earlier search, even
+        # when this one only counts or fails.
+        self._last_results = []
+        limit = None
+        if option is not None and option.upper() == "COUNT":
+            num_results = count(query, self._flags.flagged_rows)
+            if not num_results:
+                self._print(f"No search results for {query}")
+            else:
+                self._print(f"{num_results} search results for {query}")
             return
+        if option is not None:
+            limit = _parse_limit(option)
+            if limit is None:
+                self._print(f"Cannot search for {query}: Invalid limit")
+                return
 
-        self.print_video_details_search(video_results, video_tag)
+        video_results = search(query, self._flags.flagged_rows, limit)
+        self._last_results = video_results
 
-        command = input()
+        if not video_results:
+            self._print(f"No search results for {query}")
+            return video_results
+
+        self.print_video_details_search(video_results, query)
+        if not self._ask_to_play:
+            self._print("To play any of the above, enter PLAY_RESULT "
+                        "followed by the number of the video.")
+            return video_results
+
+        self._output.write(
+            "Would you like to play any of the above? If yes, specify the "
+            "number of the video.\n"
+            "If your answer is not a valid number, we will assume it's a "
+            "no.\n")
+        # The question must be visible before the answer is read.
+        self._output.flush()
+        command = self._read_answer()
 
         try:
             index = int(command) - 1
@@ -368,7 +609,26 @@ class VideoPlayer:
                 selected_video = video_results[index]
                 self.play_video(selected_video.video_id)
         except ValueError:
+            pass
+        return video_results
+
+    def play_result(self, result_number):
+        """Plays a video from the results of the last search.
+
+        Args:
+            result_number: The number the video was listed with, from 1.
+        """
+        if not self._last_results:
+            self._print("Cannot play result: No search results")
+            return
+        try:
+            index = int(result_number) - 1
+        except ValueError:
+            index = -1
+        if index not in range(len(self._last_results)):
+            self._print("Cannot play result: Invalid result number")
             return
+        self.play_video(self._last_results[index].video_id)
 
     def flag_video(self, video_id, flag_reason=""):
         """Mark a video as flagged.
@@ -377,7 +637,27 @@ class VideoPlayer:
             video_id: The video_id to be flagged.
             flag_reason: Reason for flagging the video.
         """
-        print("flag_video needs implementation")
+        video = self._video_library.get_video(video_id)
+        if video is None:
+            self._print("Cannot flag video: Video does not exist")
+            return
+
+        if video_id in self._flags:
+            self._print("Cannot flag video: Video is already flagged")
+            return
+
+        if (self._video_state.state != "STOPPED"
+                and self._video_state.video_id == video_id):
+            self.stop_video()
+
+        if not flag_reason:
+            flag_reason = "Not supplied"
+        row = self._video_library.get_row(video_id)
+        self._flags.flag(video_id, row, flag_reason)
+        if self._playable is not None:
+            self._playable.discard(row)
+        self._print(f"Successfully flagged video: {video.title} "
+                    f"(reason: {flag_reason})")
 
     def allow_video(self, video_id):
         """Removes a flag from a video.
@@ -385,7 +665,38 @@ class VideoPlayer:
         Args:
             video_id: The video_id to be allowed again.
         """
-        print("allow_video needs implementation")
+        video = self._video_library.get_video(video_id)
+        if video is None:
+            self._print("Cannot remove flag from video: Video does not exist")
+            return
 
+        if video_id not in self._flags:
+            self._print("Cannot remove flag from video: Video is not flagged")
+            return
 
-# TODO Refactor the multiple helper functions that all locate the playlist. Dictionary may be better than list, or playlist class to have a locate function
+        row = self._video_library.get_row(video_id)
+        self._flags.allow(video_id, row)
+        if self._playable is not None:
+            if 2 * len(self._flags) <= self._video_library.get_video_count():
+                self._playable = None
+            else:
+                self._playable.add(row)
+        self._print(f"Successfully removed flag from video: {video.title}")
+
+
+def _parse_limit(page_size):
+    """Returns a page size or limit argument as an int, None if it is not a
+    positive number."""
+    try:
+        page_size = int(page_size)
+    except ValueError:
+        return None
+    return page_size if page_size > 0 else None
+
+
+def _skipped_summary(*counts):
+    """Formats the non-zero (count, reason) pairs of a bulk command."""
+    skipped = [f"{count} {reason}" for count, reason in counts if count]
+    if not skipped:
+        return ""
+    return f" (skipped: {', '.join(skipped)})"
@@ -1,13 +1,30 @@
 """A video playlist class."""
 
 
+class _Link:
+    """A playlist entry, linked to the entries before and after it."""
+
+    __slots__ = ("video", "previous", "next")
+
+    def __init__(self, video=None):
+        self.video = video
+        self.previous = self.next = self
+
+
 class Playlist:
-    """A class used to represent a Playlist."""
+    """A class used to represent a Playlist.
+
+    The videos are kept in a doubly linked list in playlist order, with a
+    dictionary from video id to list entry alongside. Checking for, adding,
+    removing and moving a video take constant time however long the
+    playlist is, and iteration can resume after any video in the playlist.
+    """
 
     def __init__(self, name):
         self._name = name
-        self._videos = []
-
+        self._links = {}
+        # The sentinel entry links the last entry back to the first.
+        self._root = _Link()
 
     @property
     def name(self):
@@ -19,17 +36,73 @@ class Playlist:
 
     @property
     def videos(self):
-        return self._videos
+        """Returns an iterator over the videos in playlist order."""
+        return self.iter_videos()
+
+    def iter_videos(self, after=None):
+        """Iterates over the videos in playlist order.
+
+        Args:
+            after: The id of a video in the playlist to start after,
+                instead of starting from the first video.
+        """
+        link = self._root if after is None else self._links[after]
+        link = link.next
+        while link is not self._root:
+            yield link.video
+            link = link.next
 
-    @videos.setter
-    def videos(self, video):
-        self._videos.append(video)
+    def __len__(self):
+        return len(self._links)
+
+    def __contains__(self, video_id):
+        return video_id in self._links
+
+    def _insert(self, link, last):
+        """Links an entry in at the end, or the start if last is False."""
+        before = self._root.previous if last else self._root
+        link.previous = before
+        link.next = before.next
+        before.next.previous = link
+        before.next = link
+
+    @staticmethod
+    def _unlink(link):
+        link.previous.next = link.next
+        link.next.previous = link.previous
+
+    def add_video(self, video):
+        """Appends a video to the playlist.
+
+        Returns:
+            False if the video was already in the playlist, True otherwise.
+        """
+        if video.video_id in self._links:
+            return False
+        link = _Link(video)
+        self._links[video.video_id] = link
+        self._insert(link, last=True)
+        return True
 
     def delete_video(self, video_id):
-        for video in self._videos:
-            if video.video_id == video_id:
-                self._videos.remove(video)
-                return
+        """Removes a video from the playlist.
+
+        Returns:
+            False if the video was not in the playlist, True otherwise.
+        """
+        link = self._links.pop(video_id, None)
+        if link is None:
+            return False
+        self._unlink(link)
+        return True
+
+    def move_video(self, video_id, last=True):
+        """Moves a video in the playlist to the end, or the start if last is
+        False."""
+        link = self._links[video_id]
+        self._unlink(link)
+        self._insert(link, last)
 
     def clear(self):
-        self._videos.clear()
\ No newline at end of file
+        self._links.clear()
+        self._root.previous = self._root.next = self._root
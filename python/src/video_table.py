@@ -0,0 +1,166 @@
+"""A columnar video table class."""
+
+from array import array
+
+from .tag_dictionary import TagDictionary
+from .video import Video, render_details
+
+# Markers of the id slots that hold no row.
+_EMPTY = -1
+_REMOVED = -2
+
+_INITIAL_SLOTS = 8
+
+
+class VideoTable:
+    """A class used to store many videos compactly.
+
+    Each video is a row spread over parallel columns instead of an object of
+    its own. The titles and ids of all the videos are kept UTF-8 encoded in
+    one byte string each, with arrays of offsets marking where each row
+    starts, so a video costs a few bytes more than its text rather than a
+    Python string per field. The tags are kept as tag ids in one flat array
+    the same way, so a tag string is stored once however many videos use
+    it. Rows are found by id in an open addressing hash table of row
+    numbers, which compares against the stored ids instead of keeping
+    them again as dictionary keys. Video objects and strings are only
+    created when a row is read.
+    """
+
+    def __init__(self):
+        self._titles = bytearray()
+        self._title_starts = array("Q", [0])
+        self._video_ids = bytearray()
+        self._video_id_starts = array("Q", [0])
+        self._tag_dictionary = TagDictionary()
+        self._tag_ids = array("I")
+        self._tag_starts = array("I", [0])
+        # The rows in the order their videos were added.
+        self._order = array("I")
+        self._slots = array("i", [_EMPTY]) * _INITIAL_SLOTS
+        self._used_slots = 0
+
+    def __len__(self):
+        return len(self._order)
+
+    @property
+    def tag_dictionary(self):
+        return self._tag_dictionary
+
+    def __contains__(self, video_id):
+        return self.row(video_id) is not None
+
+    def append(self, title, video_id, tags):
+        """Adds a video to the table.
+
+        A video whose id is already in the table replaces the existing one.
+
+        Returns:
+            The row of the added video.
+        """
+        row = len(self._title_starts) - 1
+        self._titles += title.encode("utf-8")
+        self._title_starts.append(len(self._titles))
+        self._video_ids += video_id.encode("utf-8")
+        self._video_id_starts.append(len(self._video_ids))
+        self._tag_ids.extend(
+            self._tag_dictionary.intern(tag) for tag in tags)
+        self._tag_starts.append(len(self._tag_ids))
+
+        slot, replaced_row = self._find_slot(video_id)
+        if replaced_row is None:
+            self._order.append(row)
+            if self._slots[slot] == _EMPTY:
+                self._used_slots += 1
+        else:
+            self._order[self._order.index(replaced_row)] = row
+        self._slots[slot] = row
+        if self._used_slots * 2 > len(self._slots):
+            self._resize()
+        return row
+
+    def remove(self, video_id):
+        """Removes a video from the table.
+
+        The row is no longer returned by row() or rows(), but its column
+        entries are left in place so the other rows keep their numbers.
+
+        Raises:
+            KeyError: The video is not in the table.
+        """
+        slot, row = self._find_slot(video_id)
+        if row is None:
+            raise KeyError(video_id)
+        self._slots[slot] = _REMOVED
+        del self._order[self._order.index(row)]
+
+    def _find_slot(self, video_id):
+        """Probes the id slots for a video.
+
+        Returns:
+            The slot holding the video and its row, or the slot to store
+            the video in and None if it is not in the table.
+        """
+        slots = self._slots
+        mask = len(slots) - 1
+        slot = hash(video_id) & mask
+        free_slot = None
+        while True:
+            row = slots[slot]
+            if row == _EMPTY:
+                return (slot if free_slot is None else free_slot), None
+            if row == _REMOVED:
+                if free_slot is None:
+                    free_slot = slot
+            elif self.video_id(row) == video_id:
+                return slot, row
+            slot = (slot + 1) & mask
+
+    def _resize(self):
+        """Rebuilds the id slots at four times the number of videos,
+        dropping the removed ones."""
+        size = _INITIAL_SLOTS
+        while size < 4 * len(self._order):
+            size *= 2
+        slots = array("i", [_EMPTY]) * size
+        mask = size - 1
+        for row in self._order:
+            slot = hash(self.video_id(row)) & mask
+            while slots[slot] != _EMPTY:
+                slot = (slot + 1) & mask
+            slots[slot] = row
+        self._slots = slots
+        self._used_slots = len(self._order)
+
+    def row(self, video_id):
+        """Returns the row of a video, None if it is not in the table."""
+        return self._find_slot(video_id)[1]
+
+    def rows(self):
+        """Returns the rows of all the videos in insertion order."""
+        return self._order
+
+    def title(self, row):
+        return self._titles[
+            self._title_starts[row]:self._title_starts[row + 1]].decode()
+
+    def video_id(self, row):
+        return self._video_ids[
+            self._video_id_starts[row]:self._video_id_starts[row + 1]
+        ].decode()
+
+    def tag_ids(self, row):
+        return self._tag_ids[self._tag_starts[row]:self._tag_starts[row + 1]]
+
+    def tags(self, row):
+        return tuple(map(self._tag_dictionary.tag, self.tag_ids(row)))
+
+    def details(self, row):
+        """Returns the video stored at a row as "title (video_id) [tags]"."""
+        return render_details(
+            self.title(row), self.video_id(row),
+            map(self._tag_dictionary.tag, self.tag_ids(row)))
+
+    def video(self, row):
+        """Returns the Video stored at a row."""
+        return Video(self.title(row), self.video_id(row), self.tags(row))
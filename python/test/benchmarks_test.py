@@ -0,0 +1,25 @@
+from benchmarks.commands import generate_catalog, run_benchmarks
+from src.video_library import VideoLibrary
+
+
+def test_generate_catalog(tmp_path):
+    video_path = tmp_path / "videos.txt"
+    generate_catalog(video_path, 200)
+    library = VideoLibrary(video_path)
+    assert library.get_video_count() == 200
+    assert library.get_video("video_199") is not None
+
+
+def test_run_benchmarks(tmp_path):
+    results = run_benchmarks(200, tmp_path, min_time=0, max_iterations=3)
+    assert results["videos"] == 200
+    assert len(results["commands"]) == 28
+    for summary in results["commands"].values():
+        assert summary["iterations"] == 3
+        assert summary["min_us"] <= summary["median_us"] <= summary["p95_us"]
+
+
+def test_run_selected_benchmarks(tmp_path):
+    results = run_benchmarks(
+        200, tmp_path, min_time=0, max_iterations=1, names={"PLAY"})
+    assert list(results["commands"]) == ["PLAY"]
@@ -0,0 +1,67 @@
+import pytest
+
+from src.command_parser import CommandException, CommandParser
+from src.video_player import VideoPlayer
+
+
+def test_dispatches_case_insensitively(capfd):
+    parser = CommandParser(VideoPlayer())
+    parser.execute_command(["play", "amazing_cats_video_id"])
+    parser.execute_command(["NUMBER_OF_VIDEOS", "ignored"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert lines == ["Playing video: Amazing Cats", "5 videos in the library"]
+
+
+def test_rejects_wrong_number_of_arguments():
+    parser = CommandParser(VideoPlayer())
+    with pytest.raises(CommandException, match="followed by video_id"):
+        parser.execute_command(["PLAY"])
+
+
+def test_registered_command(capfd):
+    class EchoParser(CommandParser):
+        pass
+
+    EchoParser.register_command(
+        "ECHO", lambda parser, text: print(text), (1,), "Usage: ECHO <text>",
+        "ECHO <text> - Prints the text.")
+    parser = EchoParser(VideoPlayer())
+    parser.execute_command(["echo", "hello"])
+    parser.execute_command(["HELP"])
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert lines[0] == "hello"
+    assert lines[-3:] == [
+        "    ECHO <text> - Prints the text.",
+        "    EXIT - Terminates the program execution.",
+        "",
+    ]
+
+    CommandParser(VideoPlayer()).execute_command(["ECHO", "hello"])
+    out, err = capfd.readouterr()
+    assert out == ("Please enter a valid command, type HELP for a list of "
+                   "available commands.\n")
+
+
+def test_variadic_command(capfd):
+    parser = CommandParser(VideoPlayer())
+    parser.execute_command(["CREATE_PLAYLIST", "my_playlist"])
+    parser.execute_command([
+        "ADD_MANY_TO_PLAYLIST", "my_playlist", "amazing_cats_video_id",
+        "funny_dogs_video_id"])
+    out, err = capfd.readouterr()
+    assert out.splitlines()[1] == "Added 2 videos to my_playlist"
+    with pytest.raises(CommandException):
+        parser.execute_command(["ADD_MANY_TO_PLAYLIST", "my_playlist"])
+
+
+def test_paged_command(capfd):
+    parser = CommandParser(VideoPlayer())
+    parser.execute_command(["SHOW_ALL_VIDEOS", "1", "funny_dogs_video_id"])
+    out, err = capfd.readouterr()
+    assert out.splitlines()[1:] == [
+        "  Life at Google (life_at_google_video_id) [#google #career]",
+        "Next page: SHOW_ALL_VIDEOS 1 life_at_google_video_id"]
+    with pytest.raises(CommandException, match="page size and a cursor"):
+        parser.execute_command(["SHOW_ALL_VIDEOS", "1", "a", "b"])
@@ -0,0 +1,51 @@
+from src.flag_store import FlagStore, RowBitmap
+from src.output_sink import ListSink
+from src.video_player import VideoPlayer
+
+
+def test_row_bitmap():
+    rows = RowBitmap()
+    rows.add(3)
+    rows.add(1000)
+    rows.add(3)
+
+    assert len(rows) == 2
+    assert 3 in rows and 1000 in rows
+    assert 4 not in rows and 5000 not in rows
+    rows.discard(3)
+    rows.discard(4)
+    assert len(rows) == 1
+    assert 3 not in rows
+
+
+def test_flag_store():
+    flags = FlagStore()
+    flags.flag("a_id", 7, "spam")
+
+    assert "a_id" in flags
+    assert flags.reason("a_id") == "spam"
+    assert 7 in flags.flagged_rows
+    flags.allow("a_id", 7)
+    assert not flags
+    assert flags.reason("a_id") is None
+    assert 7 not in flags.flagged_rows
+
+
+def test_flags_are_per_player():
+    first_output, second_output = ListSink(), ListSink()
+    first = VideoPlayer(output=first_output)
+    second = VideoPlayer(output=second_output)
+    first.flag_video("amazing_cats_video_id")
+    second.play_video("amazing_cats_video_id")
+
+    assert second_output.lines == ["Playing video: Amazing Cats"]
+
+
+def test_flag_suffixes_follow_flag_state():
+    flags = FlagStore()
+    flags.flag("a_id", 3, "dont_like")
+    assert flags.suffix("a_id") == " - FLAGGED (reason: dont_like)"
+    assert flags.row_suffix(3) == " - FLAGGED (reason: dont_like)"
+    flags.allow("a_id", 3)
+    assert flags.suffix("a_id") == ""
+    assert flags.row_suffix(3) == ""
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+
+from src.library_backend import LibraryBackend, open_library
+from src.sqlite_video_library import import_videos
+from src.video_catalog import compile_catalog
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+VIDEOS_PATH = Path(__file__).parent.parent / "src" / "videos.txt"
+
+
+@pytest.fixture(params=["memory", "mmap", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        path = VIDEOS_PATH
+    elif request.param == "mmap":
+        path = tmp_path / "videos.cat"
+        compile_catalog(VIDEOS_PATH, path)
+    else:
+        path = tmp_path / "videos.db"
+        import_videos(VIDEOS_PATH, path)
+    library = open_library(request.param, path)
+    yield library
+    if request.param != "memory":
+        library.close()
+
+
+def test_backends_implement_interface(backend):
+    assert isinstance(backend, LibraryBackend)
+    assert backend.get_video_count() == 5
+    assert [video.title for video in backend.iter_sorted_videos()] == [
+        "Amazing Cats", "Another Cat Video", "Funny Dogs", "Life at Google",
+        "Video about nothing"]
+    assert [video.video_id for video in backend.search_titles("cat")] == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+    assert [video.video_id for video in backend.search_tags("#google")] == [
+        "life_at_google_video_id"]
+    assert backend.get_random_video() is not None
+
+
+def test_backends_limit_and_count_searches(backend):
+    row = backend.get_row("amazing_cats_video_id")
+    assert [video.video_id for video in backend.search_titles("a", limit=3)] == [
+        "amazing_cats_video_id", "another_cat_video_id",
+        "life_at_google_video_id"]
+    assert [video.video_id
+            for video in backend.search_tags("#animal", {row}, limit=1)] == [
+        "another_cat_video_id"]
+    assert backend.count_titles("cat") == 2
+    assert backend.count_titles("cat", {row}) == 1
+    assert backend.count_tags("#a") == 3
+    assert backend.count_tags("career") == 1
+
+
+def test_backends_iterate_after_video(backend):
+    assert [video.video_id for video
+            in backend.iter_sorted_videos("funny_dogs_video_id")] == [
+        "life_at_google_video_id", "nothing_video_id"]
+    assert list(backend.iter_sorted_videos("nothing_video_id")) == []
+    assert list(backend.iter_sorted_videos("does_not_exist")) == []
+
+
+def test_backends_iterate_rendered_videos(backend):
+    rows = {backend.get_row(video.video_id): video.details
+            for video in backend.get_all_videos()}
+    assert [details for _, details in backend.iter_sorted_details()] == [
+        video.details for video in backend.iter_sorted_videos()]
+    assert all(rows[row] == details
+               for row, details in backend.iter_sorted_details())
+    assert [details for _, details
+            in backend.iter_sorted_details("life_at_google_video_id")] == [
+        "Video about nothing (nothing_video_id) []"]
+
+
+def test_player_runs_on_every_backend(backend, capfd):
+    player = VideoPlayer(backend)
+    player.flag_video("amazing_cats_video_id")
+    player.show_all_videos()
+    player.play_random_video()
+    out, err = capfd.readouterr()
+    assert "Amazing Cats (amazing_cats_video_id) [#cat #animal] - FLAGGED" in out
+    assert "Playing video: Amazing Cats\n" not in out
+
+
+def test_default_memory_backend_is_shared():
+    assert open_library() is VideoLibrary.shared()
+
+
+def test_memory_backend_from_path_is_frozen():
+    assert open_library("memory", VIDEOS_PATH).frozen
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        open_library("tape")
@@ -0,0 +1,33 @@
+import io
+
+from src.output_sink import BufferedSink, ListSink, NullSink
+from src.video_player import VideoPlayer
+
+
+def test_player_writes_to_list_sink(capfd):
+    output = ListSink()
+    player = VideoPlayer(output=output)
+    player.show_all_videos()
+    out, err = capfd.readouterr()
+    assert out == ""
+    assert len(output.lines) == 6
+    assert output.lines[1] == "  Amazing Cats (amazing_cats_video_id) [#cat #animal]"
+    assert output.lines[5] == "  Video about nothing (nothing_video_id) []"
+
+
+def test_buffered_sink_holds_output_until_flushed():
+    stream = io.StringIO()
+    output = BufferedSink(stream, buffer_size=10)
+    output.write("short\n")
+    assert stream.getvalue() == ""
+    output.write("long enough\n")
+    assert stream.getvalue() == "short\nlong enough\n"
+    output.write("tail\n")
+    output.flush()
+    assert stream.getvalue().endswith("tail\n")
+
+
+def test_null_sink_discards_output(capfd):
+    VideoPlayer(output=NullSink()).number_of_videos()
+    out, err = capfd.readouterr()
+    assert out == ""
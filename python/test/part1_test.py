@@ -23,6 +23,36 @@ def test_show_all_videos(capfd):
     assert "Video about nothing (nothing_video_id) []" in lines[5]
 
 
+def test_show_all_videos_in_pages(capfd):
+    player = VideoPlayer()
+    player.show_all_videos("2")
+    player.show_all_videos("2", "another_cat_video_id")
+    player.show_all_videos("2", "life_at_google_video_id")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 10
+    assert "Amazing Cats (amazing_cats_video_id)" in lines[1]
+    assert "Another Cat Video (another_cat_video_id)" in lines[2]
+    assert "Next page: SHOW_ALL_VIDEOS 2 another_cat_video_id" == lines[3]
+    assert "Funny Dogs (funny_dogs_video_id)" in lines[5]
+    assert "Life at Google (life_at_google_video_id)" in lines[6]
+    assert "Next page: SHOW_ALL_VIDEOS 2 life_at_google_video_id" == lines[7]
+    assert "Video about nothing (nothing_video_id)" in lines[9]
+
+
+def test_show_all_videos_invalid_page(capfd):
+    player = VideoPlayer()
+    player.show_all_videos("0")
+    player.show_all_videos("ten")
+    player.show_all_videos("2", "does_not_exist")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 3
+    assert "Cannot show videos: Invalid page size" in lines[0]
+    assert "Cannot show videos: Invalid page size" in lines[1]
+    assert "Cannot show videos: Invalid cursor" in lines[2]
+
+
 def test_play_video(capfd):
     player = VideoPlayer()
     player.play_video("amazing_cats_video_id")
@@ -235,3 +235,101 @@ def test_delete_playlist_nonexistent(capfd):
     lines = out.splitlines()
     assert len(lines) == 1
     assert "Cannot delete playlist my_cool_playlist: Playlist does not exist" in lines[0]
+
+
+def test_add_many_to_playlist(capfd):
+    player = VideoPlayer()
+    player.create_playlist("my_playlist")
+    player.add_to_playlist("my_playlist", "funny_dogs_video_id")
+    player.add_many_to_playlist(
+        "my_PLAYLIST", "amazing_cats_video_id", "funny_dogs_video_id",
+        "amazing_cats_video_id", "does_not_exist", "nothing_video_id")
+    player.show_playlist("my_playlist")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 7
+    assert ("Added 2 videos to my_PLAYLIST (skipped: 1 already added, "
+            "1 do not exist)") in lines[2]
+    assert "Funny Dogs (funny_dogs_video_id)" in lines[4]
+    assert "Amazing Cats (amazing_cats_video_id)" in lines[5]
+    assert "Video about nothing (nothing_video_id)" in lines[6]
+
+
+def test_add_many_to_playlist_from_file(capfd, tmp_path):
+    id_file = tmp_path / "ids.txt"
+    id_file.write_text("amazing_cats_video_id\nfunny_dogs_video_id\n")
+    player = VideoPlayer()
+    player.create_playlist("my_playlist")
+    player.add_many_to_playlist("my_playlist", f"@{id_file}")
+    player.add_many_to_playlist("another_playlist", f"@{id_file}")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 3
+    assert "Added 2 videos to my_playlist" == lines[1]
+    assert ("Cannot add videos to another_playlist: Playlist does not "
+            "exist") in lines[2]
+
+
+def test_many_from_unreadable_file(capfd, tmp_path):
+    missing = tmp_path / "missing.txt"
+    player = VideoPlayer()
+    player.create_playlist("my_playlist")
+    player.add_many_to_playlist("my_playlist", f"@{missing}")
+    player.remove_many_from_playlist("my_playlist", f"@{tmp_path}")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 3
+    assert f"Cannot add videos to my_playlist: Cannot read {missing}" == lines[1]
+    assert (f"Cannot remove videos from my_playlist: Cannot read "
+            f"{tmp_path}") == lines[2]
+
+
+def test_many_without_id_files(capfd, tmp_path):
+    id_file = tmp_path / "ids.txt"
+    id_file.write_text("amazing_cats_video_id\n")
+    player = VideoPlayer(id_files=False)
+    player.create_playlist("my_playlist")
+    player.add_many_to_playlist("my_playlist", f"@{id_file}")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 2
+    assert ("Added 0 videos to my_playlist (skipped: 1 do not exist)"
+            == lines[1])
+
+
+def test_remove_many_from_playlist(capfd):
+    player = VideoPlayer()
+    player.create_playlist("my_playlist")
+    player.add_many_to_playlist(
+        "my_playlist", "amazing_cats_video_id", "funny_dogs_video_id")
+    player.remove_many_from_playlist(
+        "my_playlist", "amazing_cats_video_id", "nothing_video_id",
+        "does_not_exist")
+    player.show_playlist("my_playlist")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 5
+    assert ("Removed 1 videos from my_playlist (skipped: 1 not in playlist, "
+            "1 do not exist)") in lines[2]
+    assert "Funny Dogs (funny_dogs_video_id)" in lines[4]
+
+
+def test_show_playlist_in_pages(capfd):
+    player = VideoPlayer()
+    player.create_playlist("my_playlist")
+    player.add_many_to_playlist(
+        "my_playlist", "funny_dogs_video_id", "amazing_cats_video_id",
+        "nothing_video_id")
+    player.show_playlist("my_playlist", "2")
+    player.show_playlist("my_PLAYLIST", "2", "amazing_cats_video_id")
+    player.show_playlist("my_playlist", "2", "another_cat_video_id")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 9
+    assert "Funny Dogs (funny_dogs_video_id)" in lines[3]
+    assert "Amazing Cats (amazing_cats_video_id)" in lines[4]
+    assert ("Next page: SHOW_PLAYLIST my_playlist 2 "
+            "amazing_cats_video_id") == lines[5]
+    assert "Showing playlist: my_PLAYLIST" in lines[6]
+    assert "Video about nothing (nothing_video_id)" in lines[7]
+    assert "Cannot show playlist my_playlist: Invalid cursor" in lines[8]
@@ -20,6 +20,14 @@ def test_search_videos_with_no_answer(capfd):
     assert "Playing video" not in out
 
 
+def test_search_videos_reads_input_patched_after_creation(capfd):
+    player = VideoPlayer()
+    with mock.patch('builtins.input', lambda *args: '1'):
+        player.search_videos("cat")
+    out, err = capfd.readouterr()
+    assert out.splitlines()[-1] == "Playing video: Amazing Cats"
+
+
 @mock.patch('builtins.input', lambda *args: '2')
 def test_search_videos_and_play_answer(capfd):
     player = VideoPlayer()
@@ -140,3 +148,70 @@ def test_search_videos_tag_no_results(capfd):
     lines = out.splitlines()
     assert len(lines) == 1
     assert "No search results for #blah" in lines[0]
+
+
+@mock.patch('builtins.input', lambda *args: '1')
+def test_search_videos_with_limit(capfd):
+    player = VideoPlayer()
+    player.search_videos("a", "2")
+    player.search_videos("cat", "none")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 7
+    assert "Here are the results for a:" in lines[0]
+    assert "1) Amazing Cats (amazing_cats_video_id) [#cat #animal]" in lines[1]
+    assert "2) Another Cat Video (another_cat_video_id) [#cat #animal]" in lines[2]
+    assert "Playing video: Amazing Cats" in lines[5]
+    assert "Cannot search for cat: Invalid limit" in lines[6]
+
+
+def test_search_videos_count(capfd):
+    player = VideoPlayer()
+    player.flag_video("amazing_cats_video_id")
+    player.search_videos("cat", "COUNT")
+    player.search_videos_tag("#ANIMAL", "count")
+    player.search_videos_tag("#blah", "COUNT")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 4
+    assert "1 search results for cat" in lines[1]
+    assert "2 search results for #ANIMAL" in lines[2]
+    assert "No search results for #blah" in lines[3]
+
+
+def test_search_videos_without_asking(capfd):
+    player = VideoPlayer(ask_to_play=False)
+    results = player.search_videos("cat")
+    player.play_result("2")
+    player.play_result("3")
+    player.search_videos_tag("#blah")
+    player.play_result("1")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert [video.video_id for video in results] == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+    assert len(lines) == 8
+    assert "Here are the results for cat:" in lines[0]
+    assert ("To play any of the above, enter PLAY_RESULT followed by the "
+            "number of the video.") in lines[3]
+    assert "Playing video: Another Cat Video" in lines[4]
+    assert "Cannot play result: Invalid result number" in lines[5]
+    assert "No search results for #blah" in lines[6]
+    assert "Cannot play result: No search results" in lines[7]
+
+
+def test_count_and_invalid_limit_clear_results(capfd):
+    player = VideoPlayer(ask_to_play=False)
+    player.search_videos("cat")
+    player.search_videos("dog", "COUNT")
+    player.play_result("1")
+    player.search_videos("cat")
+    player.search_videos_tag("#dog", "-1")
+    player.play_result("1")
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert len(lines) == 12
+    assert "1 search results for dog" in lines[4]
+    assert "Cannot play result: No search results" in lines[5]
+    assert "Cannot search for #dog: Invalid limit" in lines[10]
+    assert "Cannot play result: No search results" in lines[11]
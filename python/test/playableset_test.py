@@ -0,0 +1,54 @@
+from src.output_sink import ListSink
+from src.playable_set import PlayableSet
+from src.video_player import VideoPlayer
+
+
+def test_playable_set_add_and_discard():
+    playable = PlayableSet([4, 2, 9])
+    playable.discard(4)
+    playable.discard(4)
+    playable.add(20)
+    playable.add(2)
+
+    assert len(playable) == 3
+    assert 4 not in playable and 100 not in playable
+    assert {playable.choice() for _ in range(200)} == {2, 9, 20}
+
+
+def test_playable_set_empty_choice():
+    playable = PlayableSet([1])
+    playable.discard(1)
+    assert playable.choice() is None
+
+
+def test_play_random_skips_flagged_videos():
+    output = ListSink()
+    player = VideoPlayer(output=output)
+    for video_id in ["funny_dogs_video_id", "amazing_cats_video_id",
+                     "another_cat_video_id", "life_at_google_video_id"]:
+        player.flag_video(video_id)
+    player.play_random_video()
+    player.flag_video("nothing_video_id")
+    player.allow_video("funny_dogs_video_id")
+    player.play_random_video()
+
+    assert output.lines[4] == "Playing video: Video about nothing"
+    assert output.lines[-1] == "Playing video: Funny Dogs"
+
+
+def test_play_random_packs_rows_only_when_most_are_flagged():
+    output = ListSink()
+    player = VideoPlayer(output=output)
+    player.flag_video("funny_dogs_video_id")
+    player.flag_video("amazing_cats_video_id")
+    for _ in range(20):
+        player.play_random_video()
+    assert player._playable is None
+    assert not any("Funny Dogs" in line or "Amazing Cats" in line
+                   for line in output.lines if line.startswith("Playing"))
+
+    player.flag_video("another_cat_video_id")
+    player.play_random_video()
+    assert len(player._playable) == 2
+    player.allow_video("another_cat_video_id")
+    assert player._playable is None
@@ -0,0 +1,118 @@
+from src.output_sink import ListSink
+from src.playlist_journal import PlaylistJournal
+from src.video_player import VideoPlayer
+
+
+def _reopen(directory, compact_every=100000):
+    journal = PlaylistJournal(directory, compact_every)
+    output = ListSink()
+    player = VideoPlayer(output=output, playlist_journal=journal)
+    return player, output, journal
+
+
+def test_playlists_survive_restart(tmp_path):
+    player, _, journal = _reopen(tmp_path)
+    player.create_playlist("My_Playlist")
+    player.create_playlist("other")
+    player.add_to_playlist("my_playlist", "amazing_cats_video_id")
+    player.add_many_to_playlist(
+        "my_playlist", "funny_dogs_video_id", "nothing_video_id")
+    player.remove_from_playlist("my_playlist", "funny_dogs_video_id")
+    player.delete_playlist("OTHER")
+    journal.close()
+
+    player, output, journal = _reopen(tmp_path)
+    player.show_all_playlists()
+    player.show_playlist("my_playlist")
+    journal.close()
+    assert output.lines == [
+        "Showing all playlists:",
+        "  My_Playlist",
+        "Showing playlist: my_playlist",
+        "  Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "  Video about nothing (nothing_video_id) []",
+    ]
+
+
+def test_journal_is_compacted_into_snapshot(tmp_path):
+    player, _, journal = _reopen(tmp_path, compact_every=3)
+    player.create_playlist("my_playlist")
+    player.add_to_playlist("my_playlist", "amazing_cats_video_id")
+    player.add_to_playlist("my_playlist", "funny_dogs_video_id")
+    player.clear_playlist("my_playlist")
+    player.add_to_playlist("my_playlist", "nothing_video_id")
+    journal.close()
+
+    assert (tmp_path / "playlists.snapshot").read_text().splitlines() == [
+        "C\tmy_playlist",
+        "A\tmy_playlist\tamazing_cats_video_id",
+        "A\tmy_playlist\tfunny_dogs_video_id",
+    ]
+    assert len((tmp_path / "playlists.journal").read_text().splitlines()) == 2
+
+    player, output, journal = _reopen(tmp_path)
+    player.show_playlist("my_playlist")
+    journal.close()
+    assert output.lines == [
+        "Showing playlist: my_playlist",
+        "  Video about nothing (nothing_video_id) []",
+    ]
+
+
+def test_incomplete_last_record_is_dropped(tmp_path):
+    for torn in ("A\tmy_playlist", "A", "A\tmy_playlist\tfunny_do"):
+        journal_path = tmp_path / "playlists.journal"
+        journal_path.write_text(
+            "C\tmy_playlist\n"
+            "A\tmy_playlist\tamazing_cats_video_id\n"
+            "A\tmy_playlist\n"
+            + torn)
+
+        player, output, journal = _reopen(tmp_path)
+        player.add_to_playlist("my_playlist", "nothing_video_id")
+        player.show_playlist("my_playlist")
+        journal.close()
+        assert output.lines[1:] == [
+            "Showing playlist: my_playlist",
+            "  Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+            "  Video about nothing (nothing_video_id) []",
+        ]
+        assert journal_path.read_text().splitlines()[-2:] == [
+            "A\tmy_playlist",
+            "A\tmy_playlist\tnothing_video_id",
+        ]
+
+
+def test_bulk_changes_are_journaled(tmp_path):
+    player, _, journal = _reopen(tmp_path)
+    player.create_playlist("my_playlist")
+    player.add_many_to_playlist(
+        "my_playlist", "amazing_cats_video_id", "funny_dogs_video_id",
+        "does_not_exist")
+    player.remove_many_from_playlist(
+        "my_playlist", "amazing_cats_video_id", "nothing_video_id")
+    journal.close()
+    assert (tmp_path / "playlists.journal").read_text().splitlines() == [
+        "C\tmy_playlist",
+        "A\tmy_playlist\tamazing_cats_video_id",
+        "A\tmy_playlist\tfunny_dogs_video_id",
+        "R\tmy_playlist\tamazing_cats_video_id",
+    ]
+
+
+def test_crlf_journal_is_not_truncated(tmp_path):
+    journal_path = tmp_path / "playlists.journal"
+    crlf_journal = (b"C\tmy_playlist\r\n"
+                    b"A\tmy_playlist\tamazing_cats_video_id\r\n"
+                    b"A\tmy_playlist\tfunny_dogs_video_id\r\n")
+    journal_path.write_bytes(crlf_journal)
+
+    player, output, journal = _reopen(tmp_path)
+    player.show_playlist("my_playlist")
+    journal.close()
+    assert output.lines == [
+        "Showing playlist: my_playlist",
+        "  Amazing Cats (amazing_cats_video_id) [#cat #animal]",
+        "  Funny Dogs (funny_dogs_video_id) [#dog #animal]",
+    ]
+    assert journal_path.read_bytes() == crlf_journal
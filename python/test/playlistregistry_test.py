@@ -0,0 +1,21 @@
+from src.playlist_registry import PlaylistRegistry
+
+
+def test_registry_ignores_case():
+    registry = PlaylistRegistry()
+    playlist = registry.create("My_Playlist")
+
+    assert registry.get("my_PLAYLIST") is playlist
+    assert "MY_playlist" in registry
+    assert registry.create("my_playlist") is None
+    assert len(registry) == 1
+
+
+def test_registry_lists_playlists_sorted():
+    registry = PlaylistRegistry()
+    for name in ["b_list", "C_list", "a_list"]:
+        registry.create(name)
+    registry.delete("B_LIST")
+
+    assert [p.name for p in registry.sorted_playlists()] == ["C_list", "a_list"]
+    assert registry.delete("b_list") is None
@@ -0,0 +1,36 @@
+import io
+
+from src.command_parser import CommandParser
+from src.run import run_batch
+from src.video_player import VideoPlayer
+
+
+def test_run_batch(capfd):
+    commands = io.StringIO(
+        "PLAY amazing_cats_video_id\n"
+        "\n"
+        "PLAY\n"
+        "STOP\n"
+        "EXIT\n"
+        "SHOW_PLAYING\n")
+    executed = run_batch(CommandParser(VideoPlayer()), commands)
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert executed == 3
+    assert lines == [
+        "Playing video: Amazing Cats",
+        "Please enter PLAY command followed by video_id.",
+        "Stopping video: Amazing Cats",
+    ]
+
+
+def test_run_batch_plays_search_results(capfd):
+    commands = io.StringIO(
+        "SEARCH_VIDEOS_WITH_TAG #dog\n"
+        "PLAY_RESULT 1\n")
+    executed = run_batch(
+        CommandParser(VideoPlayer(ask_to_play=False)), commands)
+    out, err = capfd.readouterr()
+    lines = out.splitlines()
+    assert executed == 2
+    assert lines[-1] == "Playing video: Funny Dogs"
@@ -0,0 +1,111 @@
+import asyncio
+
+from src.server import GOODBYE, LINE_LIMIT, PROMPT, start_server
+from src.video_player import VideoPlayer
+
+
+async def _read_response(reader):
+    response = await reader.readuntil(PROMPT.encode())
+    return response.decode()[:-len(PROMPT)].splitlines()
+
+
+async def _run_two_sessions():
+    server = await start_server(port=0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        first_reader, first_writer = await asyncio.open_connection(
+            "127.0.0.1", port)
+        second_reader, second_writer = await asyncio.open_connection(
+            "127.0.0.1", port)
+        await _read_response(first_reader)
+        await _read_response(second_reader)
+
+        first_writer.write(b"PLAY amazing_cats_video_id\nSHOW_PLAYING\n")
+        second_writer.write(b"SHOW_PLAYING\nPLAY\n")
+        responses = [
+            await _read_response(first_reader),
+            await _read_response(first_reader),
+            await _read_response(second_reader),
+            await _read_response(second_reader),
+        ]
+
+        first_writer.write(b"EXIT\n")
+        goodbye = await first_reader.read()
+        second_writer.close()
+        first_writer.close()
+    return responses, goodbye.decode()
+
+
+def test_sessions_are_independent():
+    responses, goodbye = asyncio.run(_run_two_sessions())
+    assert responses == [
+        ["Playing video: Amazing Cats"],
+        ["Currently playing: Amazing Cats (amazing_cats_video_id) "
+         "[#cat #animal]"],
+        ["No video is currently playing"],
+        ["Please enter PLAY command followed by video_id."],
+    ]
+    assert goodbye == GOODBYE
+
+
+async def _search_and_play():
+    server = await start_server(port=0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await _read_response(reader)
+        writer.write(b"SEARCH_VIDEOS cat\nPLAY_RESULT 1\n")
+        responses = [
+            await _read_response(reader), await _read_response(reader)]
+        writer.close()
+    return responses
+
+
+def test_search_does_not_block_session():
+    search, play = asyncio.run(_search_and_play())
+    assert search[0] == "Here are the results for cat:"
+    assert play == ["Playing video: Amazing Cats"]
+
+
+async def _session(data, responses):
+    server = await start_server(port=0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await _read_response(reader)
+        writer.write(data)
+        results = [await _read_response(reader) for _ in range(responses)]
+        writer.close()
+    return results
+
+
+def test_server_does_not_read_id_files(tmp_path):
+    id_file = tmp_path / "ids.txt"
+    id_file.write_text("amazing_cats_video_id\n")
+    responses = asyncio.run(_session(
+        f"CREATE_PLAYLIST mix\nADD_MANY_TO_PLAYLIST mix @{id_file}\n"
+        .encode(), 2))
+    assert responses[1] == [
+        "Added 0 videos to mix (skipped: 1 do not exist)"]
+
+
+def test_long_line_is_skipped():
+    responses = asyncio.run(_session(
+        b"PLAY " + b"x" * LINE_LIMIT + b"\nNUMBER_OF_VIDEOS\n", 2))
+    assert responses == [
+        [f"Cannot execute command: Line is longer than {LINE_LIMIT} bytes"],
+        ["5 videos in the library"],
+    ]
+
+
+def test_failing_command_keeps_session(monkeypatch, capsys):
+    def fail(player):
+        raise RuntimeError("bug")
+
+    monkeypatch.setattr(VideoPlayer, "number_of_videos", fail)
+    responses = asyncio.run(_session(b"NUMBER_OF_VIDEOS\nPLAY\n", 2))
+    assert responses == [
+        ["Cannot execute command: Internal error"],
+        ["Please enter PLAY command followed by video_id."],
+    ]
+    assert "RuntimeError: bug" in capsys.readouterr().err
@@ -0,0 +1,99 @@
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from src import sqlite_video_library
+from src.sqlite_video_library import SqliteVideoLibrary, import_videos
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+VIDEOS_PATH = Path(__file__).parent.parent / "src" / "videos.txt"
+
+
+@pytest.fixture
+def sqlite_library(tmp_path):
+    database_path = tmp_path / "videos.db"
+    import_videos(VIDEOS_PATH, database_path)
+    library = SqliteVideoLibrary(database_path)
+    yield library
+    library.close()
+
+
+def test_sqlite_library_matches_text_library(sqlite_library):
+    library = VideoLibrary()
+    assert sqlite_library.get_video_count() == 5
+    for video in library.get_all_videos():
+        stored = sqlite_library.get_video(video.video_id)
+        assert stored.title == video.title
+        assert stored.tags == video.tags
+        row = sqlite_library.get_row(video.video_id)
+        assert sqlite_library.get_video_by_row(row).video_id == video.video_id
+    assert sqlite_library.get_video("does_not_exist") is None
+    assert sqlite_library.get_row("does_not_exist") is None
+    assert [video.video_id for video in sqlite_library.get_all_videos()] == [
+        video.video_id for video in library.get_all_videos()]
+    assert [video.title for video in sqlite_library.iter_sorted_videos()] == [
+        video.title for video in library.iter_sorted_videos()]
+
+
+def test_sqlite_library_search(sqlite_library):
+    assert [video.video_id for video in sqlite_library.search_titles("CAT")] == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+    assert [video.video_id for video in sqlite_library.search_titles("a")] == [
+        video.video_id for video in VideoLibrary().search_titles("a")]
+    assert sqlite_library.search_titles("blah") == []
+    assert [video.video_id for video in sqlite_library.search_tags("#ca")] == [
+        "amazing_cats_video_id", "another_cat_video_id",
+        "life_at_google_video_id"]
+    assert [video.video_id for video in sqlite_library.search_tags("dog")] == [
+        "funny_dogs_video_id"]
+
+
+def test_sqlite_library_search_excludes_rows(sqlite_library):
+    row = sqlite_library.get_row("amazing_cats_video_id")
+    assert [video.video_id
+            for video in sqlite_library.search_titles("cat", {row})] == [
+        "another_cat_video_id"]
+    assert [video.video_id
+            for video in sqlite_library.search_tags("#cat", {row})] == [
+        "another_cat_video_id"]
+
+
+def test_sqlite_library_pages_listings(sqlite_library):
+    with mock.patch.object(sqlite_video_library, "_PAGE_SIZE", 2):
+        assert [video.title for video in sqlite_library.iter_sorted_videos()] == [
+            video.title for video in VideoLibrary().iter_sorted_videos()]
+        assert len(sqlite_library.search_titles("o")) == 4
+
+
+def test_import_replaces_repeated_videos(tmp_path):
+    source_path = tmp_path / "videos.txt"
+    source_path.write_text(
+        "First | a_id | #one\n"
+        "Second | b_id | #two\n"
+        "First Again | a_id | #three,#one\n")
+    database_path = tmp_path / "videos.db"
+    import_videos(source_path, database_path)
+    library = SqliteVideoLibrary(database_path)
+    try:
+        assert library.get_video_count() == 2
+        assert library.get_row("a_id") == 1
+        video = library.get_video("a_id")
+        assert video.title == "First Again"
+        assert video.tags == ("#three", "#one")
+        assert [video.video_id for video in library.search_titles("first")] == [
+            "a_id"]
+        assert library.search_tags("#two")[0].video_id == "b_id"
+    finally:
+        library.close()
+
+
+def test_player_plays_from_sqlite_library(sqlite_library, capfd):
+    player = VideoPlayer(sqlite_library)
+    player.play_video("funny_dogs_video_id")
+    player.flag_video("funny_dogs_video_id")
+    player.search_videos_tag("#dog")
+    out, err = capfd.readouterr()
+    assert "Playing video: Funny Dogs" in out
+    assert "No search results for #dog" in out
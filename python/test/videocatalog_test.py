@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+
+from src.video_catalog import CatalogError, MappedVideoLibrary, compile_catalog
+from src.video_library import VideoLibrary
+from src.video_player import VideoPlayer
+
+VIDEOS_PATH = Path(__file__).parent.parent / "src" / "videos.txt"
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog_path = tmp_path / "videos.cat"
+    compile_catalog(VIDEOS_PATH, catalog_path)
+    library = MappedVideoLibrary(catalog_path)
+    yield library
+    library.close()
+
+
+def test_catalog_matches_text_library(catalog):
+    library = VideoLibrary()
+    for video in library.get_all_videos():
+        mapped = catalog.get_video(video.video_id)
+        assert mapped.title == video.title
+        assert mapped.tags == video.tags
+    assert catalog.get_video("does_not_exist") is None
+    assert [video.title for video in catalog.get_all_videos()] == sorted(
+        video.title for video in library.get_all_videos())
+
+
+def test_catalog_search(catalog):
+    assert [video.video_id for video in catalog.search_titles("CAT")] == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+    assert [video.video_id for video in catalog.search_tags("#ca")] == [
+        "amazing_cats_video_id", "another_cat_video_id",
+        "life_at_google_video_id"]
+
+
+def test_player_plays_from_catalog(catalog, capfd):
+    player = VideoPlayer(catalog)
+    player.play_video("funny_dogs_video_id")
+    out, err = capfd.readouterr()
+    assert "Playing video: Funny Dogs" in out
+
+
+def test_rejects_non_catalog_file(tmp_path):
+    with pytest.raises(CatalogError):
+        MappedVideoLibrary(VIDEOS_PATH)
+
+
+def test_catalog_iterates_in_title_order(catalog):
+    assert catalog.get_video_count() == 5
+    assert [video.title for video in catalog.iter_sorted_videos()] == [
+        video.title for video in catalog.get_all_videos()]
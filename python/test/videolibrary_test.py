@@ -1,4 +1,8 @@
-from src.video_library import VideoLibrary
+import pytest
+
+from src.output_sink import ListSink
+from src.video_library import VideoLibrary, VideoLibraryError
+from src.video_player import VideoPlayer
 
 
 def test_library_has_all_videos():
@@ -24,3 +28,116 @@ def test_parses_video_correctly_without_tags():
     assert video.title == "Video about nothing"
     assert video.video_id == "nothing_video_id"
     assert video.tags == ()
+
+
+def test_search_titles_returns_matches_in_title_order():
+    library = VideoLibrary()
+    videos = library.search_titles("CAT")
+
+    assert [video.video_id for video in videos] == [
+        "amazing_cats_video_id", "another_cat_video_id"]
+
+
+def test_search_titles_short_and_missing_terms():
+    library = VideoLibrary()
+
+    assert len(library.search_titles("a")) == 4
+    assert library.search_titles("cats video") == []
+    assert library.search_titles("blah") == []
+
+
+def test_search_tags_matches_partial_tags_once():
+    library = VideoLibrary()
+
+    assert [video.video_id for video in library.search_tags("#CA")] == [
+        "amazing_cats_video_id", "another_cat_video_id",
+        "life_at_google_video_id"]
+    assert len(library.search_tags("#animal")) == 3
+    assert library.search_tags("#blah") == []
+
+
+def test_loads_video_file_from_path(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_bytes(
+        b"B video | b_id | #b\r\n\n"
+        b"A video | a_id |  #a , #b\n"
+        b"C video | c_id |")
+    library = VideoLibrary(video_file)
+
+    assert library.get_video("a_id").tags == ("#a", "#b")
+    assert library.get_video("missing_id") is None
+    assert [video.title for video in library.search_tags("#b")] == [
+        "A video", "B video"]
+    assert library.get_video("c_id").tags == ()
+
+
+def test_duplicate_id_later_in_file_replaces_video(tmp_path):
+    video_file = tmp_path / "videos.txt"
+    video_file.write_text(
+        "Dup Old | dup | #old\n"
+        + "".join(f"Video {number} | id_{number} |\n"
+                  for number in range(5000))
+        + "Dup New | dup | #new\n")
+    library = VideoLibrary(video_file)
+    library.freeze()
+
+    assert library.get_video("dup").title == "Dup New"
+    player = VideoPlayer(library, output=ListSink())
+    player.flag_video("dup")
+    assert player.search_videos("dup") == []
+    player.play_video("dup")
+    assert player.output.lines[-1] == (
+        "Cannot play video: Video is currently flagged (reason: Not "
+        "supplied)")
+
+
+def test_tag_id_lookups():
+    library = VideoLibrary()
+    cat_id = library.get_tag_id("#cat")
+
+    assert library.get_tag(cat_id) == "#cat"
+    assert cat_id in library.get_tag_ids("amazing_cats_video_id")
+    assert library.get_tag_ids("does_not_exist") is None
+    assert library.get_tag_id("#CAT") is None
+    assert library.find_tag_ids("#CA") == [
+        library.get_tag_id("#career"), cat_id]
+    assert len(library.get_videos_with_tag_ids([cat_id])) == 2
+
+
+def test_add_and_remove_videos_keep_title_order():
+    library = VideoLibrary()
+    library.add_video("Baby Cats", "baby_cats_video_id", ["#cat"])
+    library.remove_video("funny_dogs_video_id")
+    library.add_video("Life at Google", "life_at_google_video_id", ["#job"])
+
+    assert library.get_video_count() == 5
+    assert [video.video_id for video in library.iter_sorted_videos()] == [
+        "amazing_cats_video_id", "another_cat_video_id",
+        "baby_cats_video_id", "life_at_google_video_id", "nothing_video_id"]
+    assert [video.video_id for video in library.search_titles("cat")] == [
+        "amazing_cats_video_id", "another_cat_video_id",
+        "baby_cats_video_id"]
+    assert library.search_tags("#dog") == []
+    assert library.get_video("life_at_google_video_id").tags == ("#job",)
+    assert not library.remove_video("funny_dogs_video_id")
+
+
+def test_rendered_videos_follow_changes():
+    library = VideoLibrary()
+    assert [details for _, details in library.iter_sorted_details()][0] == (
+        "Amazing Cats (amazing_cats_video_id) [#cat #animal]")
+    library.add_video("Amazing Cats", "amazing_cats_video_id", ["#kitten"])
+    assert [details for _, details in library.iter_sorted_details()][0] == (
+        "Amazing Cats (amazing_cats_video_id) [#kitten]")
+
+
+def test_shared_library_is_frozen_and_reused():
+    library = VideoLibrary.shared()
+
+    assert VideoLibrary.shared() is library
+    assert library.frozen
+    with pytest.raises(VideoLibraryError):
+        library.add_video("New", "new_video_id", [])
+    with pytest.raises(VideoLibraryError):
+        library.remove_video("amazing_cats_video_id")
+    assert library.get_video_count() == 5
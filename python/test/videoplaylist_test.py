@@ -0,0 +1,40 @@
+from src.video import Video
+from src.video_playlist import Playlist
+
+
+def test_playlist_add_contains_and_delete():
+    playlist = Playlist("my_playlist")
+    first = Video("First", "first_id", [])
+    second = Video("Second", "second_id", [])
+
+    assert playlist.add_video(first)
+    assert playlist.add_video(second)
+    assert not playlist.add_video(first)
+    assert "first_id" in playlist
+    assert playlist.delete_video("first_id")
+    assert not playlist.delete_video("first_id")
+    assert [video.video_id for video in playlist.videos] == ["second_id"]
+
+
+def test_playlist_move_video():
+    playlist = Playlist("my_playlist")
+    for video_id in ["a", "b", "c"]:
+        playlist.add_video(Video(video_id, video_id, []))
+    playlist.move_video("a")
+    playlist.move_video("c", last=False)
+
+    assert [video.video_id for video in playlist.videos] == ["c", "b", "a"]
+    assert len(playlist) == 3
+
+
+def test_playlist_iterates_after_video():
+    playlist = Playlist("my_playlist")
+    for video_id in ["a", "b", "c"]:
+        playlist.add_video(Video(video_id, video_id, []))
+
+    assert [video.video_id for video in playlist.iter_videos("a")] == [
+        "b", "c"]
+    assert list(playlist.iter_videos("c")) == []
+    playlist.clear()
+    assert list(playlist.videos) == []
+    assert len(playlist) == 0
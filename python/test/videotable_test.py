@@ -0,0 +1,57 @@
+from src.video_table import VideoTable
+
+
+def test_table_stores_videos_by_row():
+    table = VideoTable()
+    first = table.append("Title A", "a_id", ["#x", "#y"])
+    second = table.append("Title B", "b_id", [])
+
+    assert len(table) == 2
+    assert table.row("a_id") == first
+    assert table.row("missing_id") is None
+    assert table.tags(first) == ("#x", "#y")
+    assert table.tags(second) == ()
+    video = table.video(second)
+    assert (video.title, video.video_id, video.tags) == ("Title B", "b_id", ())
+    assert not hasattr(video, "__dict__")
+
+
+def test_table_replaces_duplicate_ids():
+    table = VideoTable()
+    table.append("Old", "a_id", ["#x"])
+    table.append("Other", "b_id", [])
+    table.append("New", "a_id", ["#z"])
+
+    assert len(table) == 2
+    assert [table.title(row) for row in table.rows()] == ["New", "Other"]
+    assert table.tags(table.row("a_id")) == ("#z",)
+
+
+def test_table_interns_tags():
+    table = VideoTable()
+    first = table.append("Title A", "a_id", ["#x", "#y"])
+    second = table.append("Title B", "b_id", ["#y"])
+
+    tag_id = table.tag_dictionary.tag_id("#y")
+    assert len(table.tag_dictionary) == 2
+    assert list(table.tag_ids(first))[1] == tag_id
+    assert list(table.tag_ids(second)) == [tag_id]
+    assert table.tag_dictionary.tag(tag_id) == "#y"
+
+
+def test_table_finds_rows_after_removals():
+    table = VideoTable()
+    for number in range(1000):
+        table.append(f"Title {number}", f"id_{number}", [])
+    for number in range(0, 1000, 2):
+        table.remove(f"id_{number}")
+    readded = table.append("Title é", "id_0", ["#ü"])
+
+    assert len(table) == 501
+    assert table.row("id_2") is None
+    assert table.row("id_0") == readded
+    assert table.title(readded) == "Title é"
+    assert table.tags(readded) == ("#ü",)
+    assert all(table.video_id(table.row(f"id_{number}")) == f"id_{number}"
+               for number in range(1, 1000, 2))
+    assert list(table.rows())[-1] == readded